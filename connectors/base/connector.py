@@ -11,16 +11,61 @@ The agent never imports connector code. The filesystem IS the interface.
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
+import queue
+import re
 import signal
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
-from connectors.base.message import Message, OutgoingMessage
+from connectors.base.message import ConnectorInfo, Message, OutgoingMessage, _read_each
+from connectors.base.watcher import DirectoryWatcher
+
+
+# A config value that is exactly "${VAR_NAME}"
+_ENV_REF = re.compile(r"\$\{([^}]+)\}")
+
+# Without inotify the outbox loop can only rescan. Replies tend to come in
+# bursts, so after a drain that sent something it rescans quickly and backs
+# off phase by phase to the configured interval while the outbox stays idle.
+_RESCAN_PHASES = (0.05, 0.5)
+_RESCANS_PER_PHASE = 4
+_IDLE = len(_RESCAN_PHASES) * _RESCANS_PER_PHASE  # Idle count of a settled loop
+
+
+def _rescan_delay(idle: int, interval: float) -> float:
+    """Fallback wait after `idle` consecutive drains that sent nothing."""
+    phase = idle // _RESCANS_PER_PHASE
+    if phase < len(_RESCAN_PHASES):
+        return min(_RESCAN_PHASES[phase], interval)
+    return interval
+
+
+class _LogFormatter(logging.Formatter):
+    """Log formatter that renders the asctime prefix once per second."""
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+        self._cache: tuple[int, str] = (-1, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        sec = int(record.created)
+        cached_sec, prefix = self._cache
+        if sec != cached_sec:
+            prefix = time.strftime(self.default_time_format, self.converter(sec))
+            self._cache = (sec, prefix)  # Single assignment: thread-safe swap
+        return self.default_msec_format % (prefix, record.msecs)
+
+
+# Shared by every connector's handlers
+_LOG_FORMATTER = _LogFormatter()
 
 
 class Connector(ABC):
@@ -36,12 +81,21 @@ class Connector(ABC):
 
     The base class provides:
         write_to_inbox(msg): Write a normalized Message to the inbox
+        queue_to_inbox(msg): Same, from a background thread (for handlers)
+        write_to_outbox(msg): Queue an OutgoingMessage and wake the sender
         poll_outbox(): Read and remove outgoing messages from the outbox
+        _poll_outbox_loop(): Outbox sender loop, run as a background thread
+        _async_outbox_loop(): Same, as a task on an asyncio client's loop
         run(): Full lifecycle (connect -> run_loop -> disconnect)
     """
 
     connector_type: str = ""
 
+    # Every live connector in this process; one set of signal handlers
+    # (installed by the first run()) stops them all
+    _instances: ClassVar[weakref.WeakSet[Connector]] = weakref.WeakSet()
+    _signals_installed: ClassVar[bool] = False
+
     def __init__(
         self,
         name: str,
@@ -51,6 +105,8 @@ class Connector(ABC):
         self.name = name
         self.seed_home = Path(seed_home)
         self.config = config or {}
+        # "${VAR}" config values, expanded on first get_config() lookup
+        self._resolved_config: dict[str, str] = {}
 
         # Standard directories
         self.inbox = self.seed_home / "messages" / "inbox"
@@ -58,6 +114,9 @@ class Connector(ABC):
         self.failed = self.seed_home / "messages" / "failed"
         self.log_dir = self.seed_home / "logs"
 
+        # Shared by every Message this connector builds
+        self.connector_info = ConnectorInfo(type=self.connector_type, instance=self.name)
+
         # Create directories
         for d in [self.inbox, self.outbox, self.failed, self.log_dir]:
             d.mkdir(parents=True, exist_ok=True)
@@ -66,30 +125,89 @@ class Connector(ABC):
         self.logger = logging.getLogger(f"connector.{self.name}")
         self._setup_logging()
 
-        # Graceful shutdown
-        self._running = True
-        signal.signal(signal.SIGTERM, self._handle_signal)
-        signal.signal(signal.SIGINT, self._handle_signal)
+        # Created on first concurrent outbox drain
+        self._send_pool: ThreadPoolExecutor | None = None
+
+        # Messages handed off by queue_to_inbox(); the writer thread starts
+        # on first use and is flushed by run() on shutdown
+        self._inbox_queue: queue.Queue[Message | None] = queue.Queue(
+            maxsize=int(self.get_config("inbox_queue_size", 10_000))
+        )
+        self._inbox_writer: threading.Thread | None = None
+        self._inbox_writer_lock = threading.Lock()
+
+        # Graceful shutdown (signal handlers are installed by run()).
+        # _running reads this event; waits on it return as soon as stop()
+        # is called.
+        self._stop = threading.Event()
+        self._outbox_watcher: DirectoryWatcher | None = None
+        Connector._instances.add(self)
 
     def _setup_logging(self) -> None:
+        # A connector re-created under the same name gets the same logger;
+        # replace the previous instance's handlers instead of stacking them
+        for h in list(self.logger.handlers):
+            if getattr(h, "_seed_connector", False):
+                self.logger.removeHandler(h)
+                h.close()
+
         log_file = self.log_dir / f"{self.name}.log"
         handler = logging.FileHandler(log_file)
-        handler.setFormatter(
-            logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-        )
+        handler.setFormatter(_LOG_FORMATTER)
+        handler._seed_connector = True
         self.logger.addHandler(handler)
         self.logger.setLevel(logging.INFO)
 
         # Also log to stdout
         stdout_handler = logging.StreamHandler()
-        stdout_handler.setFormatter(
-            logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-        )
+        stdout_handler.setFormatter(_LOG_FORMATTER)
+        stdout_handler._seed_connector = True
         self.logger.addHandler(stdout_handler)
 
+    @staticmethod
+    def _install_signal_handlers() -> None:
+        """Route SIGTERM/SIGINT to every connector, once per process."""
+        if Connector._signals_installed:
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return  # signal.signal() only works from the main thread
+        signal.signal(signal.SIGTERM, Connector._dispatch_signal)
+        signal.signal(signal.SIGINT, Connector._dispatch_signal)
+        Connector._signals_installed = True
+
+    @staticmethod
+    def _dispatch_signal(signum: int, frame: Any) -> None:
+        for connector in list(Connector._instances):
+            connector._handle_signal(signum, frame)
+
     def _handle_signal(self, signum: int, frame: Any) -> None:
         self.logger.info(f"Received signal {signum}, shutting down...")
-        self._running = False
+        self.stop()
+
+    def stop(self) -> None:
+        """Request shutdown. Wakes the outbox loop and any _stop.wait()."""
+        self._stop.set()
+        self.notify_outbox()
+
+    def notify_outbox(self) -> None:
+        """
+        Wake the outbox loop now instead of at its next rescan. Wakes that
+        arrive while a drain is running are kept and coalesced into one.
+        """
+        watcher = self._outbox_watcher
+        if watcher is not None:
+            watcher.wake()
+
+    @property
+    def _running(self) -> bool:
+        return not self._stop.is_set()
+
+    @_running.setter
+    def _running(self, value: bool) -> None:
+        if value:
+            self._stop.clear()
+        else:
+            self.stop()
 
     # --- Methods subclasses MUST implement ---
 
@@ -121,45 +239,218 @@ class Connector(ABC):
     def write_to_inbox(self, msg: Message) -> Path:
         """Write a normalized incoming message to the agent's inbox."""
         filepath = msg.write_to(self.inbox)
-        self.logger.info(
-            f"Inbox: [{msg.connector.type}] {msg.sender.username}: "
-            f"{msg.content.text[:80]}"
-        )
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                f"Inbox: [{msg.connector.type}] {msg.sender.username}: "
+                f"{msg.content.text[:80]}"
+            )
+        return filepath
+
+    def queue_to_inbox(self, msg: Message) -> bool:
+        """
+        Hand a message to a background writer and return at once, for
+        handlers running on a request thread or an asyncio event loop.
+        Returns False (and drops the message) if the queue is full.
+        """
+        if self._inbox_writer is None:
+            self._start_inbox_writer()
+        try:
+            self._inbox_queue.put_nowait(msg)
+        except queue.Full:
+            self.logger.warning(f"Inbox queue full; dropped message {msg.id}")
+            return False
+        return True
+
+    def _start_inbox_writer(self) -> None:
+        with self._inbox_writer_lock:
+            if self._inbox_writer is None:
+                writer = threading.Thread(
+                    target=self._inbox_writer_loop,
+                    name=f"{self.name}-inbox",
+                    daemon=True,
+                )
+                writer.start()
+                self._inbox_writer = writer
+
+    def _inbox_writer_loop(self) -> None:
+        while True:
+            msg = self._inbox_queue.get()
+            if msg is None:  # Posted by _flush_inbox()
+                return
+            try:
+                self.write_to_inbox(msg)
+            except Exception as e:
+                self.logger.error(f"Inbox write failed for message {msg.id}: {e}")
+
+    def _flush_inbox(self, timeout: float = 10.0) -> None:
+        """Write out everything still queued, then stop the writer thread."""
+        with self._inbox_writer_lock:
+            writer, self._inbox_writer = self._inbox_writer, None
+        if writer is None:
+            return
+        try:
+            self._inbox_queue.put(None, timeout=timeout)
+        except queue.Full:
+            self.logger.error("Inbox writer stalled; queued messages may be lost")
+            return
+        writer.join(timeout)
+
+    def write_to_outbox(self, msg: OutgoingMessage) -> Path:
+        """Queue an outgoing message from this process and wake the sender."""
+        filepath = msg.write_to(self.outbox)
+        self.notify_outbox()
         return filepath
 
     def poll_outbox(self) -> list[OutgoingMessage]:
         """Read and remove outgoing messages from this connector's outbox."""
+        # scandir yields names straight from getdents; no Path objects or
+        # stat calls. Filenames embed a timestamp, so name order is send order.
+        with os.scandir(self.outbox) as it:
+            entries = sorted(
+                (e.name, e.path) for e in it
+                if e.name.endswith(".json") and e.is_file()
+            )
+
         messages = []
-        for filepath in sorted(self.outbox.glob("*.json")):
+        contents = _read_each([path for _, path in entries])
+        for (name, path), data in zip(entries, contents):
             try:
-                msg = OutgoingMessage.from_file(filepath)
+                msg = OutgoingMessage.from_json(data)
                 messages.append(msg)
-                filepath.unlink()
-            except (json.JSONDecodeError, KeyError) as e:
-                self.logger.error(f"Bad outbox file {filepath}: {e}")
+                os.unlink(path)
+            except (ValueError, KeyError) as e:
+                self.logger.error(f"Bad outbox file {path}: {e}")
                 # Move to failed
-                filepath.rename(self.failed / filepath.name)
+                os.rename(path, self.failed / name)
         return messages
 
     def process_outbox(self) -> int:
-        """Poll outbox and send all pending messages. Returns count sent."""
+        """
+        Poll outbox and send all pending messages. Returns count sent.
+
+        Messages for different conversations are sent concurrently (up to
+        the send_parallelism config, default 8); messages within one
+        conversation are always sent in order.
+        """
         messages = self.poll_outbox()
+        if not messages:
+            return 0
+
+        batches: dict[Any, list[OutgoingMessage]] = {}
+        for msg in messages:
+            batches.setdefault(msg.conversation_id, []).append(msg)
+
+        workers = int(self.get_config("send_parallelism", 8))
+        if len(batches) == 1 or workers <= 1:
+            return self._send_batch(messages)
+
+        if self._send_pool is None:
+            self._send_pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"{self.name}-send"
+            )
+        return sum(self._send_pool.map(self._send_batch, batches.values()))
+
+    def _send_batch(self, messages: list[OutgoingMessage]) -> int:
+        """Send messages one after another. Returns count sent."""
         sent = 0
         for msg in messages:
             try:
                 if self.send_message(msg):
                     sent += 1
-                    self.logger.info(
-                        f"Outbox: sent to {msg.conversation_id}: {msg.text[:80]}"
-                    )
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info(
+                            f"Outbox: sent to {msg.conversation_id}: {msg.text[:80]}"
+                        )
                 else:
                     self.logger.warning(f"Failed to send message {msg.id}")
             except Exception as e:
                 self.logger.error(f"Error sending message {msg.id}: {e}")
         return sent
 
+    def _poll_outbox_loop(self, interval: float = 2.0) -> None:
+        """
+        Background thread: send outbox messages until shutdown.
+
+        Wakes as soon as a file lands in the outbox (inotify on Linux),
+        notify_outbox() or stop() is called; interval is the fallback
+        rescan period (shortened for a few seconds after each send when
+        inotify is unavailable).
+        """
+        watcher = self._outbox_watcher = DirectoryWatcher(self.outbox)
+        idle = _IDLE
+        try:
+            while not self._stop.is_set():
+                sent = 0
+                try:
+                    sent = self.process_outbox()
+                except Exception as e:
+                    self.logger.error(f"Outbox poll error: {e}")
+                idle = 0 if sent else min(idle + 1, _IDLE)
+                if watcher.event_driven:
+                    watcher.wait(interval)
+                else:
+                    watcher.wait(_rescan_delay(idle, interval))
+        finally:
+            self._outbox_watcher = None
+            watcher.close()
+
+    async def _async_send(self, msg: OutgoingMessage) -> bool:
+        """Coroutine send, for connectors that use _async_outbox_loop()."""
+        raise NotImplementedError
+
+    async def _async_send_batch(self, messages: list[OutgoingMessage]) -> int:
+        """Send one conversation's messages in order. Returns count sent."""
+        sent = 0
+        for msg in messages:
+            try:
+                if await self._async_send(msg):
+                    sent += 1
+                    if self.logger.isEnabledFor(logging.INFO):
+                        self.logger.info(
+                            f"Outbox: sent to {msg.conversation_id}: {msg.text[:80]}"
+                        )
+                else:
+                    self.logger.warning(f"Failed to send message {msg.id}")
+            except Exception as e:
+                self.logger.error(f"Error sending message {msg.id}: {e}")
+        return sent
+
+    async def _async_outbox_loop(self, interval: float = 2.0) -> None:
+        """
+        Outbox sender for connectors built on an asyncio client: run it as
+        a task on the client's own loop, with _async_send implemented.
+
+        File I/O goes to a worker thread; sends are awaited directly, with
+        conversations sent concurrently and each conversation in order.
+        Returns once stop() is called.
+        """
+        watcher = self._outbox_watcher = DirectoryWatcher(self.outbox)
+        idle = _IDLE
+        try:
+            while not self._stop.is_set():
+                sent = 0
+                try:
+                    messages = await asyncio.to_thread(self.poll_outbox)
+                    batches: dict[Any, list[OutgoingMessage]] = {}
+                    for msg in messages:
+                        batches.setdefault(msg.conversation_id, []).append(msg)
+                    sent = sum(await asyncio.gather(
+                        *(self._async_send_batch(b) for b in batches.values())
+                    ))
+                except Exception as e:
+                    self.logger.error(f"Outbox poll error: {e}")
+                idle = 0 if sent else min(idle + 1, _IDLE)
+                if watcher.event_driven:
+                    await watcher.wait_async(interval)
+                else:
+                    await watcher.wait_async(_rescan_delay(idle, interval))
+        finally:
+            self._outbox_watcher = None
+            watcher.close()
+
     def run(self) -> None:
         """Full connector lifecycle: connect -> run_loop -> disconnect."""
+        self._install_signal_handlers()
         self.logger.info(f"Starting connector: {self.name} ({self.connector_type})")
         self.logger.info(f"  Inbox:  {self.inbox}")
         self.logger.info(f"  Outbox: {self.outbox}")
@@ -174,6 +465,10 @@ class Connector(ABC):
             self.logger.error(f"Connector error: {e}", exc_info=True)
         finally:
             self.disconnect()
+            self.stop()  # Let the outbox thread exit if run_loop returned
+            self._flush_inbox()
+            if self._send_pool is not None:
+                self._send_pool.shutdown(wait=False)
             self.logger.info(f"Connector {self.name} stopped")
 
     def get_config(self, key: str, default: Any = None, env_key: str | None = None) -> Any:
@@ -183,13 +478,35 @@ class Connector(ABC):
         2. Environment variable (if env_key provided)
         3. Default value
         """
+        if key in self._resolved_config:
+            return self._resolved_config[key]
         value = self.config.get(key)
         if value is not None:
-            # Expand env vars in string values (e.g. "${SLACK_BOT_TOKEN}")
-            if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-                env_name = value[2:-1]
-                return os.environ.get(env_name, default)
+            # Expand env vars in string values (e.g. "${SLACK_BOT_TOKEN}");
+            # the prefix test keeps plain values out of the regex engine
+            if isinstance(value, str) and value.startswith("${"):
+                match = _ENV_REF.fullmatch(value)
+                if match:
+                    resolved = os.environ.get(match.group(1))
+                    if resolved is None:
+                        return default
+                    self._resolved_config[key] = resolved
+                    return resolved
             return value
         if env_key:
             return os.environ.get(env_key, default)
         return default
+
+    def get_id_config(self, key: str) -> frozenset[int]:
+        """
+        Get a list of numeric ids (chats, channels, ...) as a set of ints.
+        Ids quoted as strings in YAML are accepted; anything non-numeric is
+        skipped with a warning rather than failing connect().
+        """
+        ids = set()
+        for value in self.config.get(key) or []:
+            try:
+                ids.add(int(value))
+            except (TypeError, ValueError):
+                self.logger.warning(f"Ignoring non-numeric {key} entry: {value!r}")
+        return frozenset(ids)
@@ -10,6 +10,8 @@ from __future__ import annotations
 import importlib
 import logging
 import multiprocessing
+import multiprocessing.connection
+import os
 import signal
 import sys
 import time
@@ -18,11 +20,33 @@ from typing import Any
 
 import yaml
 
+try:
+    # libyaml-backed loader; several times faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 from connectors.base.connector import Connector
 
 
 logger = logging.getLogger("connector.manager")
 
+# Connector processes come from a forkserver where available: each child is
+# forked from a small, clean server process instead of copying the
+# manager's address space (fork) or re-importing everything (spawn).
+# A context is used so importing this module never changes the global
+# start method.
+if "forkserver" in multiprocessing.get_all_start_methods():
+    _MP_CONTEXT = multiprocessing.get_context("forkserver")
+    _MP_CONTEXT.set_forkserver_preload([
+        "connectors.base.connector",
+        "connectors.base.message",
+        "yaml",
+        "msgspec",  # Optional; missing preloads are skipped
+    ])
+else:
+    _MP_CONTEXT = multiprocessing.get_context()
+
 # Registry of built-in connector types
 CONNECTOR_REGISTRY: dict[str, str] = {
     "cli": "connectors.cli.connector",
@@ -93,8 +117,11 @@ class ConnectorManager:
     def __init__(self, seed_home: str | Path):
         self.seed_home = Path(seed_home)
         self.connectors: list[dict[str, Any]] = []
-        self.processes: dict[str, multiprocessing.Process] = {}
+        self.processes: dict[str, multiprocessing.process.BaseProcess] = {}
         self._running = True
+        # Self-pipe so a signal wakes the monitor loop immediately
+        self._wake_r: int | None = None
+        self._wake_w: int | None = None
 
     def add_connector(
         self,
@@ -117,7 +144,7 @@ class ConnectorManager:
             raise FileNotFoundError(f"Config not found: {config_path}")
 
         with open(config_path) as f:
-            raw = yaml.safe_load(f)
+            raw = yaml.load(f, Loader=_YamlLoader) or {}
 
         manager = cls(seed_home=seed_home)
 
@@ -130,10 +157,10 @@ class ConnectorManager:
 
         return manager
 
-    def _start_connector(self, entry: dict[str, Any]) -> multiprocessing.Process:
+    def _start_connector(self, entry: dict[str, Any]) -> multiprocessing.process.BaseProcess:
         """Start a single connector as a subprocess."""
         name = entry["name"]
-        proc = multiprocessing.Process(
+        proc = _MP_CONTEXT.Process(
             target=_run_connector,
             args=(entry["type"], name, str(self.seed_home), entry["config"]),
             name=f"connector-{name}",
@@ -148,6 +175,8 @@ class ConnectorManager:
         Start all connectors and monitor them.
         Blocks until stopped via signal or all connectors exit.
         """
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
         signal.signal(signal.SIGTERM, self._handle_signal)
         signal.signal(signal.SIGINT, self._handle_signal)
 
@@ -157,15 +186,29 @@ class ConnectorManager:
         for entry in self.connectors:
             self.processes[entry["name"]] = self._start_connector(entry)
 
-        # Monitor loop
-        while self._running:
-            time.sleep(2)
-
-            for entry in self.connectors:
-                name = entry["name"]
-                proc = self.processes.get(name)
+        # Monitor loop: block on the process sentinels, which become ready
+        # the moment a connector exits. No per-tick is_alive() polling, and
+        # unlike SIGCHLD/waitid this also sees forkserver children, which
+        # are not children of the manager.
+        entries = {entry["name"]: entry for entry in self.connectors}
+        stopped: set[str] = set()  # Exited and not being restarted
+        try:
+            while self._running:
+                watched = {
+                    proc.sentinel: name
+                    for name, proc in self.processes.items()
+                    if name not in stopped
+                }
+                ready = multiprocessing.connection.wait([self._wake_r, *watched])
+
+                for sentinel in ready:
+                    if sentinel == self._wake_r:
+                        os.read(self._wake_r, 512)
+                        continue
 
-                if proc and not proc.is_alive():
+                    name = watched[sentinel]
+                    proc = self.processes[name]
+                    proc.join()  # Reap; sets exitcode
                     exit_code = proc.exitcode
                     logger.warning(f"Connector {name} exited (code={exit_code})")
 
@@ -175,18 +218,31 @@ class ConnectorManager:
                             f"Connector {name} is missing dependencies. "
                             f"Install them and restart the manager."
                         )
+                        stopped.add(name)
                         continue
 
                     if restart_on_crash and self._running:
                         logger.info(f"Restarting {name} in {restart_delay}s...")
                         time.sleep(restart_delay)
-                        self.processes[name] = self._start_connector(entry)
+                        self.processes[name] = self._start_connector(entries[name])
+                        proc.close()
+                    else:
+                        stopped.add(name)
+        finally:
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_r = self._wake_w = None
 
         self._shutdown()
 
     def _handle_signal(self, signum: int, frame: Any) -> None:
         logger.info(f"Manager received signal {signum}")
         self._running = False
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except BlockingIOError:
+                pass  # Pipe already full; the loop is waking anyway
 
     def _shutdown(self) -> None:
         """Gracefully stop all connectors."""
@@ -7,38 +7,319 @@ The agent reads/writes these JSON files — it never touches connector code.
 
 from __future__ import annotations
 
+import functools
 import json
-import uuid
-from dataclasses import dataclass, field, asdict
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+try:
+    import msgspec
+    _HAS_MSGSPEC = True
+except ImportError:
+    _HAS_MSGSPEC = False
 
-@dataclass
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+if _HAS_MSGSPEC:
+    # msgspec encodes dataclasses natively, skipping the asdict() copy
+    _ENCODER = msgspec.json.Encoder()
+    _DECODER = msgspec.json.Decoder()
+
+# Per-thread scratch buffer for the compact encoding that gets reformatted
+# with indentation. Thread-local rather than per connector: platform SDKs
+# call write_to_inbox from several threads at once.
+_encode_local = threading.local()
+_ENCODE_BUF_MAX = 1024 * 1024  # Don't pin the memory of one huge message
+
+if _HAS_ORJSON:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(obj: Any, indent: int = 2) -> bytes:
+    """Encode a message dataclass as JSON bytes (msgspec > orjson > json)."""
+    if _HAS_MSGSPEC:
+        if not indent:
+            return _ENCODER.encode(obj)
+        buf = getattr(_encode_local, "buf", None)
+        if buf is None:
+            buf = _encode_local.buf = bytearray(4096)
+        _ENCODER.encode_into(obj, buf)
+        data = msgspec.json.format(buf, indent=indent)
+        if len(buf) > _ENCODE_BUF_MAX:
+            del _encode_local.buf
+        return data
+    if _HAS_ORJSON and indent in (0, 2):
+        # orjson serializes dataclasses natively and only supports 2-space indent
+        opts = _ORJSON_OPTS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTS
+        return orjson.dumps(obj, option=opts)
+    return json.dumps(obj, default=_json_default, indent=indent or None).encode()
+
+
+def _json_default(obj: Any) -> Any:
+    # Slotted dataclasses have no __dict__; build a shallow field dict and
+    # let json recurse into nested messages itself (no copied tree)
+    fields = getattr(obj, "__dataclass_fields__", None)
+    if fields is not None:
+        return {name: getattr(obj, name) for name in fields}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _loads(data: str | bytes | memoryview) -> Any:
+    """Decode JSON into plain Python objects. Raises ValueError on bad input."""
+    if _HAS_MSGSPEC:
+        return _DECODER.decode(data)
+    if _HAS_ORJSON:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()  # json.loads takes no buffers
+    return json.loads(data)
+
+
+def _decode_into(cls: type, data: str | bytes | memoryview) -> Any:
+    """
+    Decode JSON into an instance of the flat dataclass cls.
+
+    With msgspec the instance is built straight from the JSON by a typed
+    decoder, with no intermediate dict and no from_dict pass. Only for
+    classes whose field defaults match from_dict's (OutgoingMessage;
+    Message.from_dict keeps a missing timestamp empty, which the dataclass
+    default would not). Input whose field types don't match the
+    annotations (an int conversation_id, say) fails validation and takes
+    the lenient from_dict path, so both routes accept the same files.
+    """
+    if _HAS_MSGSPEC:
+        try:
+            return _typed_decoder(cls).decode(data)
+        except msgspec.ValidationError:
+            pass
+    return cls.from_dict(_loads(data))
+
+
+@functools.cache
+def _typed_decoder(cls: type) -> Any:
+    return msgspec.json.Decoder(cls)
+
+
+@functools.lru_cache(maxsize=4)
+def _utc_second(sec: int) -> tuple[str, str]:
+    """ISO-8601 and filename prefixes for one UTC second (formatted once)."""
+    dt = datetime.fromtimestamp(sec, timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S"), dt.strftime("%Y%m%d_%H%M%S")
+
+
+def _iso_now() -> str:
+    """Same as datetime.now(timezone.utc).isoformat(), without the datetime."""
+    sec, us = divmod(time.time_ns() // 1000, 1_000_000)
+    prefix = _utc_second(sec)[0]
+    return f"{prefix}.{us:06d}+00:00" if us else f"{prefix}+00:00"
+
+
+_last_file_us = 0
+_file_ts_lock = threading.Lock()
+
+
+def _file_ts() -> str:
+    """
+    Sortable filename timestamp: %Y%m%d_%H%M%S_%f in UTC.
+
+    Strictly increasing within a process: a call in the same microsecond
+    as the last one (or after the clock stepped back) takes the next
+    microsecond, so back-to-back writes keep their order and never share
+    a filename.
+    """
+    global _last_file_us
+    with _file_ts_lock:
+        now = max(time.time_ns() // 1000, _last_file_us + 1)
+        _last_file_us = now
+    sec, us = divmod(now, 1_000_000)
+    return f"{_utc_second(sec)[1]}_{us:06d}"
+
+
+_ID_POOL_SIZE = 4096
+_id_pool = b""
+_id_pos = 0
+_id_lock = threading.Lock()
+
+
+def _reset_id_pool() -> None:
+    # A forked child must not reuse the parent's random bytes
+    global _id_pool, _id_pos
+    _id_pool, _id_pos = b"", 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_id_pool)
+
+
+def _new_id() -> str:
+    """
+    Time-ordered unique id (ULID-style): 64-bit ns timestamp + 64 random
+    bits, as 32 hex chars. Random bytes come from a pooled os.urandom
+    read, so most ids cost no syscall.
+    """
+    global _id_pool, _id_pos
+    with _id_lock:
+        if _id_pos >= len(_id_pool):
+            _id_pool = os.urandom(_ID_POOL_SIZE)
+            _id_pos = 0
+        rand = _id_pool[_id_pos:_id_pos + 8]
+        _id_pos += 8
+    return f"{time.time_ns():016x}{rand.hex()}"
+
+
+_READ_CHUNK = 64 * 1024
+
+
+def _read_bytes(filepath: str | Path) -> bytes:
+    """
+    Read a whole file with raw os.open/os.read/os.close.
+
+    Message files are small, so this is usually three syscalls: a short
+    read on a regular file means EOF, so no fstat or confirming read is
+    needed (unlike Path.read_bytes, which goes through a buffered reader).
+    """
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        data = os.read(fd, _READ_CHUNK)
+        if len(data) < _READ_CHUNK:
+            return data
+        chunks = [data]
+        while data:
+            data = os.read(fd, _READ_CHUNK)
+            chunks.append(data)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+_HAS_PREADV = sys.platform.startswith("linux") and hasattr(os, "preadv")
+
+
+def _read_each(paths: list[str]) -> Iterator[bytes | memoryview]:
+    """
+    Yield the contents of each file in paths, in order (for draining a
+    directory of small message files).
+
+    On Linux every file is read with preadv into one reusable buffer, so
+    a drain of N files allocates no per-file read buffer; the yielded
+    memoryview is only valid until the next item is requested. Files
+    that fill the buffer, and other platforms, go through _read_bytes.
+    """
+    if not _HAS_PREADV:
+        for path in paths:
+            yield _read_bytes(path)
+        return
+
+    buf = bytearray(_READ_CHUNK)
+    view = memoryview(buf)
+    flags = os.O_RDONLY | os.O_CLOEXEC
+    for path in paths:
+        fd = os.open(path, flags)
+        try:
+            n = os.preadv(fd, [buf], 0)
+        finally:
+            os.close(fd)
+        yield view[:n] if n < _READ_CHUNK else _read_bytes(path)
+
+
+def _write_bytes(filepath: str | Path, data: bytes) -> None:
+    """
+    Write a whole file with raw os.open/os.write/os.close.
+
+    Skips the buffered writer Path.write_bytes builds, along with its
+    fstat/isatty probes; data is handed to the kernel straight from the
+    encoder's bytes object.
+    """
+    fd = os.open(
+        filepath,
+        os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0),
+        0o666,
+    )
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_atomic(directory: Path, filename: str, data: bytes) -> Path:
+    """
+    Write data to directory/filename so it appears complete or not at all.
+
+    Data goes to a hidden ".<name>.tmp" sibling first and is renamed into
+    place with os.replace (atomic on POSIX and Windows). Readers that
+    filter on "*.json" (the agent loop, poll_outbox) never see a partial
+    file. The directory is created if missing.
+    """
+    filepath = directory / filename
+    tmp = directory / f".{filename}.tmp"
+    try:
+        _write_bytes(tmp, data)
+    except FileNotFoundError:
+        # Connectors create their directories up front, so mkdir only
+        # runs here, on the rare write to a directory that doesn't exist
+        directory.mkdir(parents=True, exist_ok=True)
+        _write_bytes(tmp, data)
+    os.replace(tmp, filepath)
+    return filepath
+
+
+@dataclass(slots=True, frozen=True)
 class ConnectorInfo:
-    """Identifies which connector produced/consumes a message."""
+    """
+    Identifies which connector produced/consumes a message.
+    Immutable, so one instance per connector is shared by all its messages.
+    """
     type: str          # "slack", "discord", "cli", etc.
     instance: str      # "slack-main", "discord-dev", etc.
 
+    def to_dict(self) -> dict:
+        return {"type": self.type, "instance": self.instance}
 
-@dataclass
+
+@dataclass(slots=True)
 class Sender:
     """Who sent the message."""
     id: str
     username: str
     display_name: str = ""
 
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "username": self.username,
+            "display_name": self.display_name,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Content:
     """Message content."""
     text: str
     media_type: str = "text"           # "text", "image", "file", etc.
     attachments: list[dict] = field(default_factory=list)
 
+    def to_dict(self) -> dict:
+        return {
+            "text": self.text,
+            "media_type": self.media_type,
+            "attachments": [dict(a) for a in self.attachments],
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """Where the message was sent."""
     id: str
@@ -46,8 +327,16 @@ class Conversation:
     name: str = ""
     thread_id: str | None = None
 
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "type": self.type,
+            "name": self.name,
+            "thread_id": self.thread_id,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     Standard incoming message format (v1.0).
@@ -60,51 +349,73 @@ class Message:
     content: Content
     conversation: Conversation
     version: str = "1.0"
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    timestamp: str = field(
-        default_factory=lambda: datetime.now(timezone.utc).isoformat()
-    )
+    id: str = field(default_factory=_new_id)
+    timestamp: str = field(default_factory=_iso_now)
     metadata: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        # Built by hand: dataclasses.asdict() recurses via deepcopy.
+        # Serialization doesn't go through here; see _dumps().
+        return {
+            "connector": self.connector.to_dict(),
+            "sender": self.sender.to_dict(),
+            "content": self.content.to_dict(),
+            "conversation": self.conversation.to_dict(),
+            "version": self.version,
+            "id": self.id,
+            "timestamp": self.timestamp,
+            "metadata": dict(self.metadata),
+        }
 
     def to_json(self, indent: int = 2) -> str:
-        return json.dumps(self.to_dict(), indent=indent)
+        return _dumps(self, indent).decode()
 
     def write_to(self, directory: Path) -> Path:
         """Write message as JSON to a directory. Returns the file path."""
-        directory.mkdir(parents=True, exist_ok=True)
         # Use connector instance + timestamp for unique, sortable filenames
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        ts = _file_ts()
         filename = f"{self.connector.instance}_{ts}.json"
-        filepath = directory / filename
-        filepath.write_text(self.to_json())
-        return filepath
+        return _write_atomic(directory, filename, _dumps(self))
 
     @classmethod
     def from_dict(cls, data: dict) -> Message:
+        # Specialized by hand for the poll/read hot path: direct lookups
+        # and positional construction instead of **kwargs per nested
+        # object, and no default objects built when the key is present.
+        c = data["connector"]
+        s = data["sender"]
+        ct = data["content"]
+        cv = data["conversation"]
         return cls(
-            version=data.get("version", "1.0"),
-            id=data.get("id", str(uuid.uuid4())),
-            timestamp=data.get("timestamp", ""),
-            connector=ConnectorInfo(**data["connector"]),
-            sender=Sender(**data["sender"]),
-            content=Content(**data["content"]),
-            conversation=Conversation(**data["conversation"]),
-            metadata=data.get("metadata", {}),
+            ConnectorInfo(c["type"], c["instance"]),
+            Sender(s["id"], s["username"], s.get("display_name", "")),
+            Content(
+                ct["text"],
+                ct.get("media_type", "text"),
+                ct["attachments"] if "attachments" in ct else [],
+            ),
+            Conversation(
+                cv["id"],
+                cv.get("type", "channel"),
+                cv.get("name", ""),
+                cv.get("thread_id"),
+            ),
+            data.get("version", "1.0"),
+            data["id"] if "id" in data else _new_id(),
+            data.get("timestamp", ""),
+            data["metadata"] if "metadata" in data else {},
         )
 
     @classmethod
-    def from_json(cls, json_str: str) -> Message:
-        return cls.from_dict(json.loads(json_str))
+    def from_json(cls, json_str: str | bytes) -> Message:
+        return cls.from_dict(_loads(json_str))
 
     @classmethod
-    def from_file(cls, filepath: Path) -> Message:
-        return cls.from_json(filepath.read_text())
+    def from_file(cls, filepath: str | Path) -> Message:
+        return cls.from_dict(_loads(_read_bytes(filepath)))
 
 
-@dataclass
+@dataclass(slots=True)
 class OutgoingMessage:
     """
     Message the agent writes to outbox for a connector to send.
@@ -117,34 +428,42 @@ class OutgoingMessage:
     text: str                          # What to send
     thread_id: str | None = None       # Reply to thread (optional)
     metadata: dict[str, Any] = field(default_factory=dict)
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "connector_instance": self.connector_instance,
+            "conversation_id": self.conversation_id,
+            "text": self.text,
+            "thread_id": self.thread_id,
+            "metadata": dict(self.metadata),
+            "id": self.id,
+        }
 
     def to_json(self, indent: int = 2) -> str:
-        return json.dumps(self.to_dict(), indent=indent)
+        return _dumps(self, indent).decode()
 
     def write_to(self, directory: Path) -> Path:
         """Write outgoing message to a directory. Returns the file path."""
-        directory.mkdir(parents=True, exist_ok=True)
-        ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        ts = _file_ts()
         filename = f"out_{ts}.json"
-        filepath = directory / filename
-        filepath.write_text(self.to_json())
-        return filepath
+        return _write_atomic(directory, filename, _dumps(self))
 
     @classmethod
     def from_dict(cls, data: dict) -> OutgoingMessage:
         return cls(
-            connector_instance=data["connector_instance"],
-            conversation_id=data["conversation_id"],
-            text=data["text"],
-            thread_id=data.get("thread_id"),
-            metadata=data.get("metadata", {}),
-            id=data.get("id", str(uuid.uuid4())),
+            data["connector_instance"],
+            data["conversation_id"],
+            data["text"],
+            data.get("thread_id"),
+            data["metadata"] if "metadata" in data else {},
+            data["id"] if "id" in data else _new_id(),
         )
 
     @classmethod
-    def from_file(cls, filepath: Path) -> OutgoingMessage:
-        return cls.from_dict(json.loads(filepath.read_text()))
+    def from_json(cls, json_str: str | bytes | memoryview) -> OutgoingMessage:
+        return _decode_into(cls, json_str)
+
+    @classmethod
+    def from_file(cls, filepath: str | Path) -> OutgoingMessage:
+        return _decode_into(cls, _read_bytes(filepath))
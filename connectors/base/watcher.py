@@ -0,0 +1,176 @@
+"""
+Directory watcher for event-driven outbox delivery.
+
+On Linux this uses inotify (via ctypes, no extra dependencies) so the
+outbox poller sleeps until the agent actually writes a file. Everywhere
+else it degrades to a plain timed wait, i.e. the old polling behaviour.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+from pathlib import Path
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+# How often the asyncio fallback checks for wake() between sleeps
+_WAKE_POLL_INTERVAL = 0.05
+
+_libc: ctypes.CDLL | None = None
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        except OSError:
+            return None
+        if not hasattr(libc, "inotify_init1"):  # Very old libcs
+            return None
+        _libc = libc
+    return _libc
+
+
+class DirectoryWatcher:
+    """
+    Wait for files to be written or moved into a directory.
+
+    Usage:
+        watcher = DirectoryWatcher(outbox)
+        while running:
+            process(outbox)
+            watcher.wait(timeout=2.0)   # Returns early when a file lands
+        watcher.close()
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fd: int | None = None
+        self._wake_r: int | None = None
+        self._wake_w: int | None = None
+        self._woken = threading.Event()  # wake() for the timed-wait fallback
+        # wake() may run on another thread; the lock keeps it from writing
+        # to a pipe fd that close() has released (and the OS may have reused)
+        self._lock = threading.Lock()
+        self._closed = False
+
+        libc = _load_libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return
+        wd = libc.inotify_add_watch(
+            fd, os.fsencode(self.path), IN_CLOSE_WRITE | IN_MOVED_TO
+        )
+        if wd < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+        # Self-pipe so wake() can interrupt a wait blocked in select()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    @property
+    def event_driven(self) -> bool:
+        """True if backed by inotify rather than a timed sleep."""
+        return self._fd is not None
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until a file lands in the directory or timeout elapses.
+        Returns True if woken by a filesystem event.
+        """
+        if self._fd is None:
+            self._woken.wait(timeout)
+            self._woken.clear()
+            return False
+
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in ready:
+            self._drain(self._wake_r)
+        if self._fd not in ready:
+            return False
+        self._drain(self._fd)
+        return True
+
+    def wake(self) -> None:
+        """Make a blocked (or the next) wait() return immediately. No-op once closed."""
+        with self._lock:
+            if self._closed:
+                return
+            self._woken.set()
+            if self._wake_w is not None:
+                try:
+                    os.write(self._wake_w, b"\0")
+                except BlockingIOError:
+                    pass  # Pipe full: already woken
+
+    async def wait_async(self, timeout: float) -> bool:
+        """
+        Coroutine form of wait() for connectors that run an asyncio loop:
+        the inotify fd (and wake pipe) are registered with the loop instead
+        of blocking a thread in select().
+        """
+        if self._fd is None:
+            # No fd to hand the loop; check the wake() flag in short slices
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while not self._woken.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(remaining, _WAKE_POLL_INTERVAL))
+            self._woken.clear()
+            return False
+
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fds = (self._fd, self._wake_r)
+
+        def on_readable(fd: int) -> None:
+            # The fd stays readable until drained; resolve only once
+            if not ready.done():
+                ready.set_result(fd)
+
+        for fd in fds:
+            loop.add_reader(fd, on_readable, fd)
+        try:
+            fired = await asyncio.wait_for(ready, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            for fd in fds:
+                loop.remove_reader(fd)
+        for fd in fds:
+            self._drain(fd)
+        return fired == self._fd
+
+    @staticmethod
+    def _drain(fd: int) -> None:
+        """Discard queued events / wake bytes; callers rescan the directory anyway."""
+        while True:
+            try:
+                if not os.read(fd, 4096):
+                    return
+            except BlockingIOError:
+                return
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for attr in ("_fd", "_wake_r", "_wake_w"):
+                fd = getattr(self, attr)
+                if fd is not None:
+                    setattr(self, attr, None)
+                    os.close(fd)
@@ -12,11 +12,9 @@ from __future__ import annotations
 
 import sys
 import threading
-import time
 
 from connectors.base.connector import Connector
 from connectors.base.message import (
-    ConnectorInfo,
     Content,
     Conversation,
     Message,
@@ -44,7 +42,9 @@ class CLIConnector(Connector):
 
     def run_loop(self) -> None:
         # Start outbox poller in background
-        poller = threading.Thread(target=self._poll_outbox_loop, daemon=True)
+        poller = threading.Thread(
+            target=self._poll_outbox_loop, args=(self._poll_interval,), daemon=True
+        )
         poller.start()
 
         print("=" * 50)
@@ -67,7 +67,7 @@ class CLIConnector(Connector):
 
             # Normalize to standard message format and write to inbox
             msg = Message(
-                connector=ConnectorInfo(type="cli", instance=self.name),
+                connector=self.connector_info,
                 sender=Sender(
                     id=self._username,
                     username=self._username,
@@ -83,15 +83,6 @@ class CLIConnector(Connector):
             self.write_to_inbox(msg)
             print("  (message delivered to inbox)")
 
-    def _poll_outbox_loop(self) -> None:
-        """Background thread: poll outbox and print responses."""
-        while self._running:
-            try:
-                self.process_outbox()
-            except Exception as e:
-                self.logger.error(f"Outbox poll error: {e}")
-            time.sleep(self._poll_interval)
-
 
 if __name__ == "__main__":
     import argparse
@@ -18,13 +18,10 @@ Config (connectors.yml):
 from __future__ import annotations
 
 import asyncio
-import threading
-import time
 from typing import Any
 
 from connectors.base.connector import Connector
 from connectors.base.message import (
-    ConnectorInfo,
     Content,
     Conversation,
     Message,
@@ -57,8 +54,9 @@ class DiscordConnector(Connector):
                 "Set DISCORD_TOKEN env var or configure in connectors.yml."
             )
 
-        self._allowed_guilds = set(self.config.get("guilds", []))
-        self._allowed_channels = set(self.config.get("channels", []))
+        # discord.py ids are ints
+        self._allowed_guilds = self.get_id_config("guilds")
+        self._allowed_channels = self.get_id_config("channels")
         self._poll_interval = self.config.get("outbox_poll_interval", 2.0)
 
         # Set up discord client
@@ -67,6 +65,10 @@ class DiscordConnector(Connector):
         intents.dm_messages = True
         self._client = discord.Client(intents=intents)
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._outbox_task: asyncio.Task | None = None
+        # Resolved channels/threads keyed by their id string as it appears
+        # in outbox messages; dropped when discord reports a delete
+        self._channel_cache: dict[str, Any] = {}
 
         self._register_handlers()
 
@@ -76,6 +78,8 @@ class DiscordConnector(Connector):
         self.logger.info("Discord connector disconnecting")
 
     def send_message(self, msg: OutgoingMessage) -> bool:
+        # Entry point for callers on other threads; the outbox itself is
+        # drained on the client's loop by _async_outbox_loop
         if not self._loop:
             return False
         try:
@@ -87,8 +91,17 @@ class DiscordConnector(Connector):
             self.logger.error(f"Failed to send: {e}")
             return False
 
+    def _resolve_channel(self, conversation_id: str) -> Any:
+        """Channel for an outbox conversation_id, cached after first lookup."""
+        channel = self._channel_cache.get(conversation_id)
+        if channel is None:
+            channel = self._client.get_channel(int(conversation_id))
+            if channel is not None:
+                self._channel_cache[conversation_id] = channel
+        return channel
+
     async def _async_send(self, msg: OutgoingMessage) -> bool:
-        channel = self._client.get_channel(int(msg.conversation_id))
+        channel = self._resolve_channel(msg.conversation_id)
         if not channel:
             self.logger.error(f"Channel not found: {msg.conversation_id}")
             return False
@@ -96,7 +109,11 @@ class DiscordConnector(Connector):
         if msg.thread_id:
             # Reply in thread
             try:
-                thread = channel.get_thread(int(msg.thread_id))
+                thread = self._channel_cache.get(msg.thread_id)
+                if thread is None:
+                    thread = channel.get_thread(int(msg.thread_id))
+                    if thread is not None:
+                        self._channel_cache[msg.thread_id] = thread
                 if thread:
                     await thread.send(msg.text)
                     return True
@@ -107,11 +124,7 @@ class DiscordConnector(Connector):
         return True
 
     def run_loop(self) -> None:
-        # Start outbox poller in background
-        poller = threading.Thread(target=self._poll_outbox_loop, daemon=True)
-        poller.start()
-
-        # Run discord client (blocks)
+        # Run discord client (blocks); the outbox loop starts in on_ready
         self._client.run(self._token, log_handler=None)
 
     def _is_allowed(self, message: Any) -> bool:
@@ -127,8 +140,21 @@ class DiscordConnector(Connector):
     def _register_handlers(self) -> None:
         @self._client.event
         async def on_ready() -> None:
-            self._loop = asyncio.get_event_loop()
+            self._loop = asyncio.get_running_loop()
             self.logger.info(f"Connected as {self._client.user}")
+            # on_ready fires again after every reconnect; start one sender
+            if self._outbox_task is None or self._outbox_task.done():
+                self._outbox_task = asyncio.create_task(
+                    self._async_outbox_loop(self._poll_interval)
+                )
+
+        @self._client.event
+        async def on_guild_channel_delete(channel: Any) -> None:
+            self._channel_cache.pop(str(channel.id), None)
+
+        @self._client.event
+        async def on_thread_delete(thread: Any) -> None:
+            self._channel_cache.pop(str(thread.id), None)
 
         @self._client.event
         async def on_message(message: discord.Message) -> None:
@@ -148,7 +174,7 @@ class DiscordConnector(Connector):
                 conv_name = f"#{message.channel.name}"
 
             msg = Message(
-                connector=ConnectorInfo(type="discord", instance=self.name),
+                connector=self.connector_info,
                 sender=Sender(
                     id=str(message.author.id),
                     username=message.author.name,
@@ -172,15 +198,7 @@ class DiscordConnector(Connector):
                     "is_mention": self._client.user in message.mentions if self._client.user else False,
                 },
             )
-            self.write_to_inbox(msg)
-
-    def _poll_outbox_loop(self) -> None:
-        while self._running:
-            try:
-                self.process_outbox()
-            except Exception as e:
-                self.logger.error(f"Outbox poll error: {e}")
-            time.sleep(self._poll_interval)
+            self.queue_to_inbox(msg)
 
 
 if __name__ == "__main__":
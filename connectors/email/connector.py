@@ -1,8 +1,10 @@
 """
 Email Connector — IMAP/SMTP using Python stdlib.
 
-Polls an IMAP mailbox for new messages, normalizes to standard format.
-Sends outgoing messages via SMTP. No external dependencies required.
+Watches an IMAP mailbox for new messages, normalizes to standard format.
+Uses IMAP IDLE push when the server supports it (single folder), and
+polls otherwise. Sends outgoing messages via SMTP. No external
+dependencies required.
 
 Config (connectors.yml):
   - name: email-main
@@ -13,25 +15,34 @@ Config (connectors.yml):
     smtp_port: 587
     username: ${EMAIL_USERNAME}
     password: ${EMAIL_PASSWORD}
-    poll_interval: 60          # seconds between IMAP checks
+    poll_interval: 60          # seconds between IMAP checks (without IDLE)
+    idle: true                 # use IMAP IDLE if the server supports it
     folders: ["INBOX"]
     allowed_senders: []        # empty = allow all
+    smtp_connections: 4        # max concurrent SMTP sessions for sends
 """
 
 from __future__ import annotations
 
+import base64
 import email
 import email.utils
 import imaplib
+import itertools
+import quopri
+import select
 import smtplib
+import socket
 import threading
 import time
-from email.mime.text import MIMEText
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesHeaderParser
+from html.parser import HTMLParser
 from typing import Any
 
 from connectors.base.connector import Connector
 from connectors.base.message import (
-    ConnectorInfo,
     Content,
     Conversation,
     Message,
@@ -39,6 +50,212 @@ from connectors.base.message import (
     Sender,
 )
 
+# RFC 2177: servers may drop an IDLE after 30 minutes; re-issue before that
+_IDLE_TIMEOUT = 29 * 60
+
+# NOOP-probe a cached SMTP connection before reuse once it has sat idle
+# this long (servers and NATs silently drop idle sessions)
+_SMTP_PROBE_AFTER = 60.0
+
+
+def _parse_imap_list(data: bytes) -> list:
+    """
+    Parse IMAP response data into nested lists: parenthesized lists become
+    lists, atoms / quoted strings / {n} literals become bytes, NIL is None.
+    Covers what FETCH returns for BODYSTRUCTURE and BODY[...] items.
+    """
+    stack: list[list] = [[]]
+    i, n = 0, len(data)
+    while i < n:
+        c = data[i]
+        if c in b" \r\n":
+            i += 1
+        elif c == 0x28:  # (
+            child: list = []
+            stack[-1].append(child)
+            stack.append(child)
+            i += 1
+        elif c == 0x29:  # )
+            if len(stack) > 1:
+                stack.pop()
+            i += 1
+        elif c == 0x22:  # "quoted string"
+            buf = bytearray()
+            i += 1
+            while i < n and data[i] != 0x22:
+                if data[i] == 0x5C:  # backslash escape
+                    i += 1
+                buf.append(data[i])
+                i += 1
+            stack[-1].append(bytes(buf))
+            i += 1
+        elif c == 0x7B:  # {size}\r\n literal
+            close = data.index(b"}", i)
+            start = close + 3
+            end = start + int(data[i + 1:close])
+            stack[-1].append(data[start:end])
+            i = end
+        else:
+            j = i
+            while j < n and data[j] not in b" ()\r\n":
+                j += 1
+            atom = data[i:j]
+            stack[-1].append(None if atom.upper() == b"NIL" else atom)
+            i = j
+    return stack[0]
+
+
+def _fetch_responses(data: list) -> list[dict[bytes, Any]]:
+    """
+    Turn imaplib FETCH data into one {ITEM-NAME: value} dict per message.
+
+    imaplib splits a response around each literal into (prefix, literal)
+    tuples followed by the remainder as bytes; rejoin those into the
+    wire form before parsing.
+    """
+    responses = []
+    acc = b""
+    for item in data:
+        if item is None:
+            continue
+        if isinstance(item, tuple):
+            acc += item[0] + b"\r\n" + item[1]
+            continue
+        parsed = _parse_imap_list(acc + item)
+        acc = b""
+        # [b"<seq>", [b"UID", b"7", b"BODYSTRUCTURE", [...], ...]]
+        if len(parsed) >= 2 and isinstance(parsed[1], list):
+            fields = parsed[1]
+            responses.append({
+                (k or b"").upper(): v for k, v in zip(fields[::2], fields[1::2])
+            })
+    return responses
+
+
+def _find_text_part(
+    structure: list, subtype: bytes = b"plain", section: str = ""
+) -> tuple[str, bytes, str | None] | None:
+    """
+    Locate the first text/<subtype> part in a parsed BODYSTRUCTURE.
+    Returns (section, transfer encoding, charset) or None. Attached
+    messages (message/rfc822) are not searched.
+    """
+    if structure and isinstance(structure[0], list):
+        # Multipart: child parts come first, then subtype and extensions
+        children = itertools.takewhile(lambda p: isinstance(p, list), structure)
+        for i, child in enumerate(children, 1):
+            found = _find_text_part(
+                child, subtype, f"{section}.{i}" if section else str(i)
+            )
+            if found:
+                return found
+        return None
+
+    if (
+        len(structure) > 5
+        and (structure[0] or b"").lower() == b"text"
+        and (structure[1] or b"").lower() == subtype
+    ):
+        params = structure[2] or []
+        charset = None
+        for key, value in zip(params[::2], params[1::2]):
+            if (key or b"").lower() == b"charset" and value:
+                charset = value.decode("ascii", errors="replace")
+        # A non-multipart message's body is section 1
+        return section or "1", (structure[5] or b"7bit").lower(), charset
+    return None
+
+
+def _decode_body(raw: bytes, encoding: bytes, charset: str | None) -> str:
+    """Undo the transfer encoding of one fetched part and decode its text."""
+    try:
+        if encoding == b"base64":
+            raw = base64.b64decode(raw)
+        elif encoding == b"quoted-printable":
+            raw = quopri.decodestring(raw)
+    except ValueError:
+        pass  # Malformed encoding: keep the raw bytes
+    try:
+        return raw.decode(charset or "utf-8", errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+class _HTMLText(HTMLParser):
+    """Collects the visible text of an HTML body, one line per block."""
+
+    _BLOCKS = frozenset({
+        "br", "p", "div", "li", "tr", "table", "blockquote", "pre",
+        "h1", "h2", "h3", "h4", "h5", "h6",
+    })
+    _HIDDEN = frozenset({"script", "style", "head", "title"})
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._chunks: list[str] = []
+        self._hidden = 0
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in self._HIDDEN:
+            self._hidden += 1
+        elif tag in self._BLOCKS:
+            self._chunks.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._HIDDEN:
+            self._hidden = max(0, self._hidden - 1)
+        elif tag in self._BLOCKS:
+            self._chunks.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._hidden:
+            self._chunks.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self._chunks).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def _html_to_text(html: str) -> str:
+    """Strip tags from an HTML-only email body."""
+    parser = _HTMLText()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+class _SocketLines:
+    """
+    CRLF line reader over the raw IMAP socket, with a timeout per read.
+
+    Used only while in IDLE: imaplib's buffered file can't be waited on
+    with a timeout, and a timed-out socket file is unusable afterwards.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._buf = b""
+
+    def readline(self, timeout: float) -> bytes | None:
+        """Next line including CRLF, or None if timeout elapses first."""
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._buf:
+            # Decrypted TLS bytes may already be waiting in the SSL object
+            pending = getattr(self._sock, "pending", None)
+            if not (pending and pending()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                ready, _, _ = select.select([self._sock], [], [], remaining)
+                if not ready:
+                    return None
+            chunk = self._sock.recv(4096)
+            if not chunk:
+                raise imaplib.IMAP4.abort("connection closed during IDLE")
+            self._buf += chunk
+        line, _, self._buf = self._buf.partition(b"\n")
+        return line + b"\n"
+
 
 class EmailConnector(Connector):
     """Email connector using stdlib IMAP/SMTP."""
@@ -54,13 +271,26 @@ class EmailConnector(Connector):
         self._password = self.get_config("password", env_key="EMAIL_PASSWORD")
         self._poll_interval = float(self.get_config("poll_interval", 60))
         self._folders = self.config.get("folders", ["INBOX"])
-        self._allowed_senders = set(self.config.get("allowed_senders", []))
+        self._allowed_senders = frozenset(
+            str(a) for a in self.config.get("allowed_senders", [])
+        )
+        self._use_idle = bool(self.get_config("idle", True))
 
         if not self._username or not self._password:
             raise ValueError(
                 "Email connector requires username and password. "
                 "Set EMAIL_USERNAME and EMAIL_PASSWORD env vars."
             )
+        self._from_header = email.utils.formataddr((None, self._username))
+
+        # Pool of logged-in SMTP sessions, reused across sends (connected on
+        # demand). Up to smtp_connections sends run at once, so the base
+        # class's per-conversation parallelism reaches the wire.
+        self._smtp_idle: list[tuple[smtplib.SMTP, float]] = []  # (session, last used)
+        self._smtp_lock = threading.Lock()
+        self._smtp_slots = threading.BoundedSemaphore(
+            max(1, int(self.get_config("smtp_connections", 4)))
+        )
 
         # Test IMAP connection
         self._imap: imaplib.IMAP4_SSL | None = None
@@ -76,6 +306,8 @@ class EmailConnector(Connector):
         except Exception:
             pass
         self._imap = imaplib.IMAP4_SSL(self._imap_host, self._imap_port)
+        # Let the kernel notice a dead connection while we sit in IDLE
+        self._imap.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
         self._imap.login(self._username, self._password)
 
     def disconnect(self) -> None:
@@ -85,22 +317,88 @@ class EmailConnector(Connector):
                 self._imap.logout()
         except Exception:
             pass
+        try:
+            self._close_smtp()
+        except Exception:
+            pass
         self.logger.info("Email connector disconnecting")
 
+    def _connect_smtp(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self._smtp_host, self._smtp_port)
+        try:
+            server.starttls()
+            server.login(self._username, self._password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _checkout_smtp(self) -> smtplib.SMTP:
+        """Idle pooled SMTP session (probed if stale), or a new one."""
+        while True:
+            with self._smtp_lock:
+                if not self._smtp_idle:
+                    break
+                server, last_used = self._smtp_idle.pop()
+            if time.monotonic() - last_used <= _SMTP_PROBE_AFTER:
+                return server
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._quit_smtp(server)
+        return self._connect_smtp()
+
+    def _checkin_smtp(self, server: smtplib.SMTP) -> None:
+        with self._smtp_lock:
+            self._smtp_idle.append((server, time.monotonic()))
+
+    @staticmethod
+    def _quit_smtp(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _close_smtp(self) -> None:
+        with self._smtp_lock:
+            idle, self._smtp_idle = self._smtp_idle, []
+        for server, _ in idle:
+            self._quit_smtp(server)
+
+    def _send_on(self, server: smtplib.SMTP, mime: EmailMessage) -> None:
+        """Send on a checked-out session, returning it to the pool if still usable."""
+        try:
+            server.send_message(mime)
+        except smtplib.SMTPServerDisconnected:
+            self._quit_smtp(server)
+            raise
+        except smtplib.SMTPException:
+            self._checkin_smtp(server)  # Rejected by the server; session is fine
+            raise
+        except BaseException:
+            self._quit_smtp(server)
+            raise
+        self._checkin_smtp(server)
+
     def send_message(self, msg: OutgoingMessage) -> bool:
         try:
-            mime = MIMEText(msg.text)
-            mime["From"] = self._username
+            mime = EmailMessage()
+            mime["From"] = self._from_header
             mime["To"] = msg.conversation_id  # conversation_id = email address
             mime["Subject"] = msg.metadata.get("subject", "Re: Seed Agent")
             if msg.thread_id:
                 mime["In-Reply-To"] = msg.thread_id
                 mime["References"] = msg.thread_id
+            mime.set_content(msg.text)
 
-            with smtplib.SMTP(self._smtp_host, self._smtp_port) as server:
-                server.starttls()
-                server.login(self._username, self._password)
-                server.send_message(mime)
+            with self._smtp_slots:
+                try:
+                    self._send_on(self._checkout_smtp(), mime)
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    # Session dropped since last use: reconnect once
+                    self._send_on(self._connect_smtp(), mime)
             return True
         except Exception as e:
             self.logger.error(f"SMTP send failed: {e}")
@@ -111,10 +409,14 @@ class EmailConnector(Connector):
         poller = threading.Thread(target=self._poll_outbox_loop, daemon=True)
         poller.start()
 
-        # Main IMAP polling loop
+        # Main IMAP loop: check, then block in IDLE until the server
+        # pushes new mail (or sleep poll_interval without IDLE)
         while self._running:
             try:
                 self._check_mail()
+                if self._can_idle():
+                    self._idle(_IDLE_TIMEOUT)
+                    continue
             except (imaplib.IMAP4.abort, imaplib.IMAP4.error, OSError) as e:
                 self.logger.warning(f"IMAP error, reconnecting: {e}")
                 try:
@@ -124,7 +426,66 @@ class EmailConnector(Connector):
             except Exception as e:
                 self.logger.error(f"Mail check error: {e}")
 
-            time.sleep(self._poll_interval)
+            self._stop.wait(self._poll_interval)
+
+    def _can_idle(self) -> bool:
+        # IDLE watches the selected mailbox only, so it needs a single folder
+        return (
+            self._use_idle
+            and self._imap is not None
+            and len(self._folders) == 1
+            and "IDLE" in self._imap.capabilities
+        )
+
+    def _idle(self, timeout: float) -> bool:
+        """
+        Wait in IMAP IDLE (RFC 2177) until the server announces new mail,
+        timeout elapses or the connector stops. Returns True on new mail.
+
+        Spoken directly on the socket: imaplib gained idle() only in 3.14.
+        """
+        imap = self._imap
+        tag = imap._new_tag()
+        try:
+            return self._idle_exchange(imap.sock, tag, timeout)
+        finally:
+            # We consumed the tagged reply ourselves; don't leave imaplib
+            # expecting it
+            imap.tagged_commands.pop(tag, None)
+
+    def _idle_exchange(self, sock: socket.socket, tag: bytes, timeout: float) -> bool:
+        sock.sendall(tag + b" IDLE\r\n")
+        lines = _SocketLines(sock)
+
+        line = lines.readline(30.0)
+        if line is None or not line.startswith(b"+"):
+            raise imaplib.IMAP4.error(f"IDLE not accepted: {line!r}")
+
+        new_mail = False
+        deadline = time.monotonic() + timeout
+        while not new_mail and self._running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # Wake at least once a second to notice shutdown
+            line = lines.readline(min(remaining, 1.0))
+            if line is None:
+                continue
+            if line.startswith(b"* BYE"):
+                raise imaplib.IMAP4.abort(line.decode(errors="replace").strip())
+            new_mail = line.rstrip().endswith((b" EXISTS", b" RECENT"))
+
+        sock.sendall(b"DONE\r\n")
+        while True:
+            line = lines.readline(30.0)
+            if line is None:
+                raise imaplib.IMAP4.abort("no response to IDLE DONE")
+            if line.startswith(tag + b" "):
+                if not line.startswith(tag + b" OK"):
+                    raise imaplib.IMAP4.error(line.decode(errors="replace").strip())
+                return new_mail
+            if line.rstrip().endswith(b" EXISTS"):
+                new_mail = True
 
     def _check_mail(self) -> None:
         """Check for unseen messages in configured folders."""
@@ -133,52 +494,87 @@ class EmailConnector(Connector):
 
         for folder in self._folders:
             self._imap.select(folder)
-            _, message_numbers = self._imap.search(None, "UNSEEN")
-
-            for num in message_numbers[0].split():
-                if not num:
-                    continue
-
-                _, msg_data = self._imap.fetch(num, "(RFC822)")
-                if not msg_data or not msg_data[0]:
-                    continue
-
-                raw = msg_data[0]
-                if isinstance(raw, tuple):
-                    raw_email = raw[1]
-                else:
-                    continue
-
-                parsed = email.message_from_bytes(raw_email)
-                self._process_email(parsed)
-
-    def _process_email(self, parsed: email.message.Message) -> None:
-        """Convert a parsed email to a standard Message."""
-        from_header = parsed.get("From", "")
-        from_name, from_addr = email.utils.parseaddr(from_header)
+            # UIDs, unlike sequence numbers, don't shift if another client
+            # expunges mail between the search and the fetch
+            _, data = self._imap.uid("SEARCH", None, "UNSEEN")
+            uids = data[0].split() if data and data[0] else []
+            if not uids:
+                continue
+
+            uid_set = b",".join(uids).decode()
+
+            # Find each message's text/plain part first (text/html only if
+            # there is none), so only that part (plus headers) is
+            # downloaded: attachments never leave the server
+            _, data = self._imap.uid("FETCH", uid_set, "(BODYSTRUCTURE)")
+            text_parts: dict[bytes, tuple[str, bytes, str | None] | None] = {}
+            html_uids: set[bytes] = set()
+            by_section: dict[str | None, list[bytes]] = {}
+            for resp in _fetch_responses(data):
+                uid = resp.get(b"UID")
+                structure = resp.get(b"BODYSTRUCTURE")
+                part = None
+                if structure:
+                    part = _find_text_part(structure)
+                    if part is None:
+                        part = _find_text_part(structure, b"html")
+                        if part is not None:
+                            html_uids.add(uid)
+                text_parts[uid] = part
+                by_section.setdefault(part[0] if part else None, []).append(uid)
+
+            # One FETCH per distinct text section (almost always 1 or 1.1)
+            # policy.default yields structured headers: From is parsed once
+            # into Address objects and encoded words come back decoded
+            parser = BytesHeaderParser(policy=policy.default)
+            processed: list[bytes] = []
+            try:
+                for section, section_uids in by_section.items():
+                    items = "BODY.PEEK[HEADER]"
+                    if section:
+                        items += f" BODY.PEEK[{section}]"
+                    _, data = self._imap.uid(
+                        "FETCH", b",".join(section_uids).decode(), f"({items})"
+                    )
+                    for resp in _fetch_responses(data):
+                        headers = parser.parsebytes(resp.get(b"BODY[HEADER]") or b"")
+                        uid = resp.get(b"UID")
+                        part = text_parts.get(uid)
+                        body = ""
+                        if part:
+                            raw = resp.get(f"BODY[{part[0]}]".encode()) or b""
+                            body = _decode_body(raw, part[1], part[2])
+                            if uid in html_uids:
+                                body = _html_to_text(body)
+                        self._process_email(headers, body)
+                        if uid:
+                            processed.append(uid)
+            finally:
+                # BODY.PEEK doesn't set \Seen. Flag whatever made it to the
+                # inbox, even if a later message failed, so a reconnect
+                # doesn't deliver it twice
+                if processed:
+                    self._imap.uid(
+                        "STORE", b",".join(processed).decode(), "+FLAGS", "(\\Seen)"
+                    )
+
+    def _process_email(self, parsed: EmailMessage, body: str) -> None:
+        """Convert an email's headers and text body to a standard Message."""
+        from_header = parsed["From"]
+        addresses = getattr(from_header, "addresses", ())
+        if addresses:
+            from_addr, from_name = addresses[0].addr_spec, addresses[0].display_name
+        else:
+            from_addr = from_name = ""
 
         # Sender filter
         if self._allowed_senders and from_addr not in self._allowed_senders:
             return
 
-        # Extract body
-        body = ""
-        if parsed.is_multipart():
-            for part in parsed.walk():
-                if part.get_content_type() == "text/plain":
-                    payload = part.get_payload(decode=True)
-                    if payload:
-                        body = payload.decode("utf-8", errors="replace")
-                    break
-        else:
-            payload = parsed.get_payload(decode=True)
-            if payload:
-                body = payload.decode("utf-8", errors="replace")
-
-        message_id = parsed.get("Message-ID", "")
+        message_id = str(parsed.get("Message-ID", ""))
 
         msg = Message(
-            connector=ConnectorInfo(type="email", instance=self.name),
+            connector=self.connector_info,
             sender=Sender(
                 id=from_addr,
                 username=from_addr,
@@ -192,21 +588,13 @@ class EmailConnector(Connector):
                 thread_id=message_id,
             ),
             metadata={
-                "subject": parsed.get("Subject", ""),
+                "subject": str(parsed.get("Subject", "")),
                 "message_id": message_id,
-                "date": parsed.get("Date", ""),
+                "date": str(parsed.get("Date", "")),
             },
         )
         self.write_to_inbox(msg)
 
-    def _poll_outbox_loop(self) -> None:
-        while self._running:
-            try:
-                self.process_outbox()
-            except Exception as e:
-                self.logger.error(f"Outbox poll error: {e}")
-            time.sleep(2)
-
 
 if __name__ == "__main__":
     import argparse
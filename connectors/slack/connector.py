@@ -3,7 +3,7 @@ Slack Connector — Socket Mode (no public URL required).
 
 Listens for messages, mentions, and reactions via Slack Socket Mode.
 Normalizes events to standard message format and writes to inbox.
-Polls outbox and sends responses via Slack API.
+Watches the outbox and sends responses via Slack API.
 
 Requires: slack-bolt, slack-sdk
 Install: pip install seed-agent[slack]
@@ -19,13 +19,11 @@ Config (connectors.yml):
 from __future__ import annotations
 
 import os
-import threading
-import time
+from types import MappingProxyType
 from typing import Any
 
 from connectors.base.connector import Connector
 from connectors.base.message import (
-    ConnectorInfo,
     Content,
     Conversation,
     Message,
@@ -40,6 +38,12 @@ try:
 except ImportError:
     _HAS_SLACK = False
 
+# Shared stand-in for a missing user_profile (read-only, never mutated)
+_NO_PROFILE = MappingProxyType({})
+
+# Message subtypes that are not new user messages
+_SKIP_SUBTYPES = frozenset({"bot_message", "message_changed", "message_deleted"})
+
 
 class SlackConnector(Connector):
     """Slack connector using Socket Mode for real-time events."""
@@ -62,7 +66,7 @@ class SlackConnector(Connector):
             )
 
         self._app = App(token=bot_token)
-        self._allowed_channels = set(self.config.get("channels", []))
+        self._allowed_channels = frozenset(str(c) for c in self.config.get("channels", []))
         self._poll_interval = self.config.get("outbox_poll_interval", 2.0)
 
         # Get bot user ID to filter self-messages
@@ -76,8 +80,13 @@ class SlackConnector(Connector):
 
         # Register event handlers
         self._register_handlers()
+        self._handler: SocketModeHandler | None = None
 
     def disconnect(self) -> None:
+        handler = getattr(self, "_handler", None)
+        if handler is not None:
+            handler.close()
+            self._handler = None
         self.logger.info("Slack connector disconnecting")
 
     def send_message(self, msg: OutgoingMessage) -> bool:
@@ -95,13 +104,13 @@ class SlackConnector(Connector):
             return False
 
     def run_loop(self) -> None:
-        # Start outbox poller in background
-        poller = threading.Thread(target=self._poll_outbox_loop, daemon=True)
-        poller.start()
+        # Socket Mode runs on the SDK's own threads once connected;
+        # SocketModeHandler.start() would only park this thread forever.
+        self._handler = SocketModeHandler(self._app, self._app_token)
+        self._handler.connect()
 
-        # Start Socket Mode handler (blocks)
-        handler = SocketModeHandler(self._app, self._app_token)
-        handler.start()
+        # The main thread drains the outbox until shutdown
+        self._poll_outbox_loop(self._poll_interval)
 
     def _is_allowed(self, channel: str, channel_type: str = "") -> bool:
         """Check if channel is allowed (DMs always allowed)."""
@@ -113,39 +122,39 @@ class SlackConnector(Connector):
 
     def _normalize_event(self, event: dict, event_type: str = "message") -> Message | None:
         """Convert a Slack event to a standard Message."""
-        user = event.get("user", "unknown")
+        get = event.get
+        user = get("user", "unknown")
 
         # Skip self-messages
         if user == self._bot_user_id:
             return None
 
-        channel = event.get("channel", "")
-        channel_type = event.get("channel_type", "")
+        channel = get("channel", "")
+        channel_type = get("channel_type", "")
 
         if not self._is_allowed(channel, channel_type):
             return None
 
         # Map Slack channel types
-        conv_type = "channel"
-        if channel_type in ("im", "mpim"):
-            conv_type = "dm"
+        conv_type = "dm" if channel_type in ("im", "mpim") else "channel"
+        profile = get("user_profile") or _NO_PROFILE
 
         return Message(
-            connector=ConnectorInfo(type="slack", instance=self.name),
+            connector=self.connector_info,
             sender=Sender(
                 id=user,
                 username=user,
-                display_name=event.get("user_profile", {}).get("display_name", user),
+                display_name=profile.get("display_name") or user,
             ),
-            content=Content(text=event.get("text", "")),
+            content=Content(text=get("text", "")),
             conversation=Conversation(
                 id=channel,
                 type=conv_type,
                 name=channel,
-                thread_id=event.get("thread_ts"),
+                thread_id=get("thread_ts"),
             ),
             metadata={
-                "slack_ts": event.get("ts", ""),
+                "slack_ts": get("ts", ""),
                 "event_type": event_type,
             },
         )
@@ -153,23 +162,23 @@ class SlackConnector(Connector):
     def _register_handlers(self) -> None:
         @self._app.event("message")
         def handle_message(event: dict, say: Any) -> None:
-            if event.get("subtype") in ("bot_message", "message_changed", "message_deleted"):
+            if event.get("subtype") in _SKIP_SUBTYPES:
                 return
             msg = self._normalize_event(event, "message")
             if msg:
-                self.write_to_inbox(msg)
+                self.queue_to_inbox(msg)
 
         @self._app.event("app_mention")
         def handle_mention(event: dict, say: Any) -> None:
             msg = self._normalize_event(event, "mention")
             if msg:
                 msg.metadata["priority"] = "high"
-                self.write_to_inbox(msg)
+                self.queue_to_inbox(msg)
 
         @self._app.event("reaction_added")
         def handle_reaction(event: dict, say: Any) -> None:
             msg = Message(
-                connector=ConnectorInfo(type="slack", instance=self.name),
+                connector=self.connector_info,
                 sender=Sender(
                     id=event.get("user", "unknown"),
                     username=event.get("user", "unknown"),
@@ -187,15 +196,7 @@ class SlackConnector(Connector):
                     "item": event.get("item", {}),
                 },
             )
-            self.write_to_inbox(msg)
-
-    def _poll_outbox_loop(self) -> None:
-        while self._running:
-            try:
-                self.process_outbox()
-            except Exception as e:
-                self.logger.error(f"Outbox poll error: {e}")
-            time.sleep(self._poll_interval)
+            self.queue_to_inbox(msg)
 
 
 if __name__ == "__main__":
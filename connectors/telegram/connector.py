@@ -17,13 +17,10 @@ Config (connectors.yml):
 from __future__ import annotations
 
 import asyncio
-import threading
-import time
 from typing import Any
 
 from connectors.base.connector import Connector
 from connectors.base.message import (
-    ConnectorInfo,
     Content,
     Conversation,
     Message,
@@ -58,7 +55,8 @@ class TelegramConnector(Connector):
                 "Set TELEGRAM_BOT_TOKEN env var or configure in connectors.yml."
             )
 
-        self._allowed_chats = set(self.config.get("allowed_chats", []))
+        # Chat ids arrive as ints
+        self._allowed_chats = self.get_id_config("allowed_chats")
         self._poll_interval = self.config.get("outbox_poll_interval", 2.0)
 
         self._app = Application.builder().token(self._token).build()
@@ -73,6 +71,8 @@ class TelegramConnector(Connector):
         self.logger.info("Telegram connector disconnecting")
 
     def send_message(self, msg: OutgoingMessage) -> bool:
+        # Entry point for callers on other threads; the outbox itself is
+        # drained on the bot's loop by _async_outbox_loop
         if not self._loop:
             return False
         try:
@@ -95,11 +95,7 @@ class TelegramConnector(Connector):
         return True
 
     def run_loop(self) -> None:
-        # Start outbox poller in background
-        poller = threading.Thread(target=self._poll_outbox_loop, daemon=True)
-        poller.start()
-
-        # Run the telegram bot (blocks)
+        # Run the telegram bot and the outbox sender on one loop (blocks)
         loop = asyncio.new_event_loop()
         self._loop = loop
         asyncio.set_event_loop(loop)
@@ -111,9 +107,8 @@ class TelegramConnector(Connector):
         await self._app.updater.start_polling()
         self.logger.info("Telegram polling started")
 
-        # Wait until stopped
-        while self._running:
-            await asyncio.sleep(1)
+        # Send outbox messages until stopped
+        await self._async_outbox_loop(self._poll_interval)
 
         await self._app.updater.stop()
         await self._app.stop()
@@ -138,7 +133,7 @@ class TelegramConnector(Connector):
         conv_type = "dm" if chat.type == "private" else "channel"
 
         msg = Message(
-            connector=ConnectorInfo(type="telegram", instance=self.name),
+            connector=self.connector_info,
             sender=Sender(
                 id=str(user.id) if user else "unknown",
                 username=user.username or "" if user else "unknown",
@@ -156,15 +151,7 @@ class TelegramConnector(Connector):
                 "chat_type": chat.type,
             },
         )
-        self.write_to_inbox(msg)
-
-    def _poll_outbox_loop(self) -> None:
-        while self._running:
-            try:
-                self.process_outbox()
-            except Exception as e:
-                self.logger.error(f"Outbox poll error: {e}")
-            time.sleep(self._poll_interval)
+        self.queue_to_inbox(msg)
 
 
 if __name__ == "__main__":
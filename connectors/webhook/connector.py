@@ -4,7 +4,7 @@ Webhook Connector — Generic HTTP endpoint using Flask.
 Accepts POST requests with JSON payloads, normalizes to standard format.
 Enables integration with any platform that can send HTTP webhooks.
 
-Requires: flask
+Requires: flask (served by waitress when installed)
 Install: pip install seed-agent[webhook]
 
 Config (connectors.yml):
@@ -14,6 +14,9 @@ Config (connectors.yml):
     port: 8080
     secret: ${WEBHOOK_SECRET}    # Optional: verify X-Webhook-Secret header
     path: /webhook               # Endpoint path
+    max_body_bytes: 1048576      # Larger requests are rejected with 413
+    wsgi_threads: 8              # Concurrent requests (waitress)
+    response_ttl: 300            # Seconds an unpolled reply is kept
 
 Expected POST body:
 {
@@ -23,33 +26,173 @@ Expected POST body:
     "thread_id": "thread-id",      # optional
     "metadata": {}                 # optional
 }
+
+Replies 202 {"status": "accepted", "message_id": ...} once the message is
+queued for the inbox (written by a background thread), or 503 if that
+queue is full.
 """
 
 from __future__ import annotations
 
 import hashlib
 import hmac
-import json
+import http.client
 import threading
 import time
+import urllib.parse
+from collections import OrderedDict
 from typing import Any
 
 from connectors.base.connector import Connector
 from connectors.base.message import (
-    ConnectorInfo,
     Content,
     Conversation,
     Message,
     OutgoingMessage,
     Sender,
+    _dumps,
+    _loads,
 )
 
 try:
-    from flask import Flask, request, jsonify
+    from flask import Flask, Response, request
     _HAS_FLASK = True
 except ImportError:
     _HAS_FLASK = False
 
+try:
+    import waitress
+    _HAS_WAITRESS = True
+except ImportError:
+    _HAS_WAITRESS = False
+
+
+def _json_response(obj: dict[str, Any], status: int) -> Response:
+    """Compact JSON response encoded by the message codec."""
+    return Response(_dumps(obj, indent=0), status=status, mimetype="application/json")
+
+
+class _PendingResponses:
+    """
+    Replies waiting for /response polling: bounded, and dropped after ttl
+    seconds if never polled. Not thread-safe; callers hold a lock.
+
+    Every entry shares one ttl, so insertion order is expiry order and
+    both expiry and eviction pop from the front.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._items: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _expire(self, now: float) -> None:
+        items = self._items
+        while items:
+            expires, _ = next(iter(items.values()))
+            if expires > now:
+                return
+            items.popitem(last=False)
+
+    def __setitem__(self, key: str, text: str) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        self._items.pop(key, None)  # Re-set moves to the back
+        self._items[key] = (now + self._ttl, text)
+        while len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+
+    def pop(self, key: str, default: str | None = None) -> str | None:
+        self._expire(time.monotonic())
+        entry = self._items.pop(key, None)
+        return entry[1] if entry else default
+
+
+class _ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections for callback POSTs, reused per host.
+
+    Without it every callback pays a new TCP (and TLS) handshake. Idle
+    connections are kept per (scheme, host, port), up to max_idle each.
+    """
+
+    def __init__(self, max_idle: int = 10, timeout: float = 10.0):
+        self._max_idle = max_idle
+        self._timeout = timeout
+        self._idle: dict[tuple[str, str, int | None], list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def post_json(self, url: str, body: bytes) -> int:
+        """POST a JSON body to url; returns the HTTP status."""
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        headers = {"Content-Type": "application/json", "Host": parts.netloc}
+
+        conn, reused = self._checkout(key)
+        try:
+            status, keep = self._send(conn, path, body, headers)
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            conn.close()
+            if not reused:
+                raise
+            # Server closed the idle socket before our request got there;
+            # nothing was processed, so retry once on a fresh connection
+            conn = self._new(key)
+            status, keep = self._send(conn, path, body, headers)
+        except Exception:
+            conn.close()
+            raise
+
+        if keep:
+            self._checkin(key, conn)
+        else:
+            conn.close()
+        return status
+
+    @staticmethod
+    def _send(conn: http.client.HTTPConnection, path: str, body: bytes,
+              headers: dict[str, str]) -> tuple[int, bool]:
+        conn.request("POST", path, body=body, headers=headers)
+        resp = conn.getresponse()
+        resp.read()  # Drain so the connection can be reused
+        return resp.status, not resp.will_close
+
+    def _new(self, key: tuple[str, str, int | None]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self._timeout)
+        if scheme == "http":
+            return http.client.HTTPConnection(host, port, timeout=self._timeout)
+        raise ValueError(f"Unsupported callback URL scheme: {scheme!r}")
+
+    def _checkout(self, key: tuple[str, str, int | None]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new(key), False
+
+    def _checkin(self, key: tuple[str, str, int | None], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
 
 class WebhookConnector(Connector):
     """Generic HTTP webhook connector using Flask."""
@@ -65,17 +208,33 @@ class WebhookConnector(Connector):
         self._host = self.get_config("host", "0.0.0.0")
         self._port = int(self.get_config("port", 8080))
         self._secret = self.get_config("secret", env_key="WEBHOOK_SECRET")
+        # Compared as bytes on every request; encode once here
+        self._secret_bytes = self._secret.encode("utf-8") if self._secret else None
         self._path = self.get_config("path", "/webhook")
         self._poll_interval = self.config.get("outbox_poll_interval", 2.0)
 
-        # Response callbacks for synchronous webhook replies
-        self._pending_responses: dict[str, str] = {}
+        # Response callbacks for synchronous webhook replies; written by the
+        # outbox senders, read by request threads
+        self._pending_responses = _PendingResponses(
+            ttl=float(self.get_config("response_ttl", 300))
+        )
+        self._responses_lock = threading.Lock()
+
+        # Keep-alive connections for callback_url replies
+        self._http = _ConnectionPool()
 
         self._flask_app = Flask(f"seed-webhook-{self.name}")
+        # Oversized bodies get a 413 before Flask buffers or parses them
+        self._flask_app.config["MAX_CONTENT_LENGTH"] = int(
+            self.get_config("max_body_bytes", 1024 * 1024)
+        )
         self._register_routes()
         self.logger.info(f"Webhook endpoint: http://{self._host}:{self._port}{self._path}")
 
     def disconnect(self) -> None:
+        http_pool = getattr(self, "_http", None)
+        if http_pool is not None:
+            http_pool.close()
         self.logger.info("Webhook connector disconnecting")
 
     def send_message(self, msg: OutgoingMessage) -> bool:
@@ -84,65 +243,87 @@ class WebhookConnector(Connector):
         callback_url = msg.metadata.get("callback_url")
         if callback_url:
             try:
-                import urllib.request
-                req = urllib.request.Request(
-                    callback_url,
-                    data=json.dumps({"text": msg.text}).encode(),
-                    headers={"Content-Type": "application/json"},
-                    method="POST",
+                status = self._http.post_json(
+                    callback_url, _dumps({"text": msg.text}, indent=0)
                 )
-                urllib.request.urlopen(req, timeout=10)
+                if status >= 400:
+                    self.logger.error(f"Callback failed: HTTP {status}")
+                    return False
                 return True
             except Exception as e:
                 self.logger.error(f"Callback failed: {e}")
                 return False
         else:
             # Store for /response endpoint polling
-            self._pending_responses[msg.conversation_id] = msg.text
+            with self._responses_lock:
+                self._pending_responses[msg.conversation_id] = msg.text
             return True
 
     def run_loop(self) -> None:
         # Start outbox poller
-        poller = threading.Thread(target=self._poll_outbox_loop, daemon=True)
+        poller = threading.Thread(
+            target=self._poll_outbox_loop, args=(self._poll_interval,), daemon=True
+        )
         poller.start()
 
-        # Run Flask (blocks)
-        self._flask_app.run(
-            host=self._host,
-            port=self._port,
-            debug=False,
-            use_reloader=False,
-        )
+        # Serve (blocks): waitress if available, else Werkzeug's dev server
+        if _HAS_WAITRESS:
+            waitress.serve(
+                self._flask_app,
+                host=self._host,
+                port=self._port,
+                threads=int(self.get_config("wsgi_threads", 8)),
+                max_request_body_size=self._flask_app.config["MAX_CONTENT_LENGTH"],
+            )
+        else:
+            self._flask_app.run(
+                host=self._host,
+                port=self._port,
+                debug=False,
+                use_reloader=False,
+                threaded=True,
+            )
 
     def _verify_secret(self, req_secret: str | None) -> bool:
         """Verify webhook secret if configured."""
-        if not self._secret:
+        if self._secret_bytes is None:
             return True
         if not req_secret:
             return False
-        return hmac.compare_digest(req_secret, self._secret)
+        return hmac.compare_digest(req_secret.encode("utf-8"), self._secret_bytes)
 
     def _register_routes(self) -> None:
         @self._flask_app.post(self._path)
-        def handle_webhook() -> tuple:
+        def handle_webhook() -> Response:
             # Verify secret
             req_secret = request.headers.get("X-Webhook-Secret")
             if not self._verify_secret(req_secret):
-                return jsonify({"error": "unauthorized"}), 401
+                return _json_response({"error": "unauthorized"}, 401)
 
-            data = request.get_json(silent=True)
-            if not data:
-                return jsonify({"error": "invalid JSON"}), 400
+            max_bytes = self._flask_app.config["MAX_CONTENT_LENGTH"]
+            if request.content_length is not None and request.content_length > max_bytes:
+                return _json_response({"error": "payload too large"}, 413)
+
+            # Decode with the message codec (msgspec/orjson when installed)
+            # instead of Flask's stdlib-json get_json()
+            if not request.is_json:
+                return _json_response({"error": "invalid JSON"}, 400)
+            try:
+                data = _loads(request.get_data(cache=False))
+            except ValueError:
+                data = None
+            if not data or not isinstance(data, dict):
+                return _json_response({"error": "invalid JSON"}, 400)
 
             text = data.get("text", "")
             if not text:
-                return jsonify({"error": "text required"}), 400
+                return _json_response({"error": "text required"}, 400)
 
             sender = data.get("sender", "webhook-user")
             channel = data.get("channel", "webhook")
 
             msg = Message(
-                connector=ConnectorInfo(type="webhook", instance=self.name),
+                connector=self.connector_info,
                 sender=Sender(
                     id=sender,
                     username=sender,
@@ -158,31 +339,26 @@ class WebhookConnector(Connector):
                 metadata=data.get("metadata", {}),
             )
 
-            filepath = self.write_to_inbox(msg)
-            return jsonify({
-                "status": "delivered",
+            # Written by the inbox writer thread; the request returns at once
+            if not self.queue_to_inbox(msg):
+                return _json_response({"error": "inbox queue full"}, 503)
+            return _json_response({
+                "status": "accepted",
                 "message_id": msg.id,
-            }), 200
+            }, 202)
 
         @self._flask_app.get(f"{self._path}/health")
-        def health() -> tuple:
-            return jsonify({"status": "ok", "connector": self.name}), 200
+        def health() -> Response:
+            return _json_response({"status": "ok", "connector": self.name}, 200)
 
         @self._flask_app.get(f"{self._path}/response/<conversation_id>")
-        def get_response(conversation_id: str) -> tuple:
+        def get_response(conversation_id: str) -> Response:
             """Poll for a response to a specific conversation."""
-            text = self._pending_responses.pop(conversation_id, None)
+            with self._responses_lock:
+                text = self._pending_responses.pop(conversation_id, None)
             if text:
-                return jsonify({"text": text}), 200
-            return jsonify({"text": None}), 204
-
-    def _poll_outbox_loop(self) -> None:
-        while self._running:
-            try:
-                self.process_outbox()
-            except Exception as e:
-                self.logger.error(f"Outbox poll error: {e}")
-            time.sleep(self._poll_interval)
+                return _json_response({"text": text}, 200)
+            return _json_response({"text": None}, 204)
 
 
 if __name__ == "__main__":
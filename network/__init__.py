@@ -0,0 +1 @@
+"""Seed network: shared insights and the tools that publish and check them."""
@@ -0,0 +1 @@
+"""Command-line tools for the seed network (also importable, e.g. by the tests)."""
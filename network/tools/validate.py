@@ -1,17 +1,26 @@
 #!/usr/bin/env python3
 """
-Validate a seed network insight YAML file.
+Validate seed network insight YAML files.
 
-Usage: python validate.py path/to/insight.yaml
+Usage: python validate.py path/to/insight.yaml [more.yaml ...]
 """
 
+import functools
+import os
+import re
 import sys
-from pathlib import Path
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 
-import yaml
+try:
+    import fastjsonschema
+    _HAS_FASTJSONSCHEMA = True
+except ImportError:
+    _HAS_FASTJSONSCHEMA = False
 
 
-REQUIRED_FIELDS = [
+REQUIRED_FIELDS = (
     "id",
     "title",
     "domain",
@@ -21,45 +30,212 @@ REQUIRED_FIELDS = [
     "timestamp",
     "version",
     "evidence",
-]
+)
 
-VALID_DOMAINS = [
+VALID_DOMAINS = (
     "operations",
     "research",
     "development",
     "communication",
     "general",
-]
+)
+
+# Hashed lookups for the checks; the tuples keep the order for messages
+_REQUIRED_SET = frozenset(REQUIRED_FIELDS)
+_VALID_DOMAINS = frozenset(VALID_DOMAINS)
+
+MIN_BODY_CHARS = 50
+
+# Same set as bytes.strip(): ASCII whitespace
+_NON_SPACE = re.compile(rb"\S")
+
+# The frontmatter rules below as a JSON Schema. Draft 4 keeps "integer"
+# strict (1.0 is not a version), matching the hand-written checks.
+INSIGHT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "type": "object",
+    "required": list(REQUIRED_FIELDS),
+    "properties": {
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "tags": {"type": "array"},
+        "evidence": {"type": "array"},
+        "domain": {"enum": list(VALID_DOMAINS)},
+        "version": {"type": "integer", "minimum": 1},
+    },
+}
+
+# Compiled once at import when fastjsonschema is installed: a valid file
+# (the common case) then costs one generated-code call. Invalid files still
+# go through _field_errors, which reports every error rather than just the
+# first.
+_fast_validate = fastjsonschema.compile(INSIGHT_SCHEMA) if _HAS_FASTJSONSCHEMA else None
+
+
+# A file modified this recently may be rewritten again within the same
+# timestamp tick (up to 2 s on FAT) without its stat changing, so its
+# result is not cached. The same "racy" rule git applies to its index.
+_RACY_NS = 2_000_000_000
 
 
 def validate_insight(filepath: str) -> list[str]:
-    """Validate an insight file. Returns list of errors (empty = valid)."""
-    errors = []
-    path = Path(filepath)
+    """
+    Validate an insight file. Returns list of errors (empty = valid).
 
-    if not path.exists():
+    Results are cached per process, keyed on the file's identity, size and
+    timestamps, so re-validating an unchanged file costs one stat.
+    """
+    try:
+        st = os.stat(filepath)
+    except (FileNotFoundError, NotADirectoryError):
         return [f"File not found: {filepath}"]
+    if time.time_ns() - st.st_mtime_ns < _RACY_NS:
+        return _validate_file(filepath, st.st_size)
+    return list(_validate_cached(
+        os.path.abspath(filepath), st.st_dev, st.st_ino, st.st_size,
+        st.st_mtime_ns, st.st_ctime_ns,
+    ))
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_cached(
+    path: str, dev: int, ino: int, size: int, mtime_ns: int, ctime_ns: int
+) -> tuple[str, ...]:
+    # Everything after path is only part of the cache key
+    return tuple(_validate_file(path, size))
+
+
+def _read_file(filepath: str, size: int, whole: bool = True) -> bytes:
+    """
+    Read a whole file with raw os.open/os.read/os.close. size comes from
+    the stat validate_insight already did, so asking for one byte more
+    makes an unchanged file a single short read, which on a regular file
+    means EOF (no buffered reader, fstat or confirming read). With
+    whole=False, read just the first size bytes.
+    """
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        if not whole:
+            return os.read(fd, size)
+        data = os.read(fd, size + 1)
+        if len(data) <= size:
+            return data
+        chunks = [data]  # Grew since the stat
+        while data:
+            data = os.read(fd, 64 * 1024)
+            chunks.append(data)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
 
-    content = path.read_text()
+# Large insights are mostly body, and the body only has to be long enough,
+# so they are first judged on this much of their head
+_HEAD_BYTES = 64 * 1024
 
-    # Check frontmatter markers
-    parts = content.split("---")
-    if len(parts) < 3:
+
+def _validate_file(filepath: str, size: int) -> list[str]:
+    """Uncached validate_insight, for a file known to exist."""
+    if size > _HEAD_BYTES:
+        head = _read_file(filepath, _HEAD_BYTES, whole=False)
+        # With the whole frontmatter in the head and a body already long
+        # enough, the rest of the file cannot change the result
+        _, end = _frontmatter_bounds(head)
+        if end >= 0 and not _check_body(head, end + 3):
+            return validate_insight_text(head)
+    return validate_insight_text(_read_file(filepath, size))
+
+
+def _frontmatter_bounds(content: bytes) -> tuple[int, int]:
+    """
+    Offsets of the opening and closing "---" markers (end is -1 if either
+    is missing). They are found in the raw bytes: UTF-8 never hides an
+    ASCII "-" inside another character.
+    """
+    start = content.find(b"---")
+    end = content.find(b"---", start + 3) if start >= 0 else -1
+    return start, end
+
+
+def validate_insight_text(content: bytes | str) -> list[str]:
+    """
+    Validate an insight given as its contents rather than a path (same
+    checks and errors as validate_insight, without the file or its cache).
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+
+    # Check frontmatter markers. Only the frontmatter is decoded; the body
+    # (from end + 3) just needs a length check, done in place.
+    start, end = _frontmatter_bounds(content)
+    if end < 0:
         return ["Missing YAML frontmatter (must be between --- markers)"]
+    try:
+        frontmatter = content[start + 3:end].decode("utf-8")
+    except UnicodeDecodeError:
+        return ["Frontmatter is not valid UTF-8"]
+
+    # Flat frontmatter (the usual shape) is read without YAML. Anything
+    # else, or anything failing the checks, gets the full parse, so the
+    # errors reported always describe what YAML sees.
+    data = _scan_frontmatter(frontmatter)
+    if data is not None and _fields_ok(data):
+        return _check_body(content, end + 3)
 
     # Parse YAML frontmatter
+    yaml, loader = _yaml()
     try:
-        data = yaml.safe_load(parts[1])
+        data = yaml.load(frontmatter, Loader=loader)
     except yaml.YAMLError as e:
         return [f"Invalid YAML: {e}"]
 
     if not isinstance(data, dict):
         return ["Frontmatter must be a YAML mapping"]
 
+    errors = _field_errors(data)
+    errors.extend(_check_body(content, end + 3))
+    return errors
+
+
+@functools.cache
+def _yaml():
+    """
+    Import PyYAML on first use, returning (module, loader). Frontmatter the
+    scanner reads never needs it, so a run over plain insights skips the
+    import (about 40 ms) entirely.
+    """
+    import yaml
+
+    try:
+        # libyaml-backed loader; several times faster than the pure-Python one
+        from yaml import CSafeLoader as loader
+    except ImportError:
+        from yaml import SafeLoader as loader
+    return yaml, loader
+
+
+def _fields_ok(data: dict) -> bool:
+    """True if the frontmatter fields pass every check."""
+    if _fast_validate is None:
+        return not _field_errors(data)
+    try:
+        _fast_validate(data)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
+
+def _field_errors(data: dict) -> list[str]:
+    """Check the frontmatter fields. Returns every error found."""
+    errors = []
+
     # Check required fields
-    for field in REQUIRED_FIELDS:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
+    missing = _REQUIRED_SET - data.keys()
+    if missing:
+        errors.extend(
+            f"Missing required field: {field}"
+            for field in REQUIRED_FIELDS
+            if field in missing
+        )
 
     # Validate field types
     if "confidence" in data:
@@ -76,39 +252,211 @@ def validate_insight(filepath: str) -> list[str]:
             errors.append("evidence must be a list")
 
     if "domain" in data:
-        if data["domain"] not in VALID_DOMAINS:
+        domain = data["domain"]
+        if not isinstance(domain, str) or domain not in _VALID_DOMAINS:
             errors.append(
-                f"domain must be one of {VALID_DOMAINS}, got: {data['domain']}"
+                f"domain must be one of {list(VALID_DOMAINS)}, got: {domain}"
             )
 
     if "version" in data:
         if not isinstance(data["version"], int) or data["version"] < 1:
             errors.append("version must be a positive integer")
 
-    # Check body content
-    body = "---".join(parts[2:]).strip()
-    if len(body) < 50:
-        errors.append("Insight body is too short (< 50 chars). Add more detail.")
-
     return errors
 
 
+# For _scan_frontmatter. Characters YAML treats specially anywhere in a
+# stream: non-printables, tab, CR, BOM and the Unicode line breaks.
+_NOT_PLAIN_TEXT = re.compile(
+    "[^\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010ffff]"
+)
+_KEY_LINE = re.compile(r"([A-Za-z_][A-Za-z0-9_]*):(?: +(.*))?")
+_QUOTED = re.compile(r'"([^"\\]*)"|\'([^\']*)\'')
+# Indicators that give a plain scalar's first character a meaning, plus
+# "<" and "=" (the merge and value tags, which yaml.safe_load rejects)
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`<=")
+_FLOW_SPECIAL = re.compile(r"[,\[\]{}:#]")
+_INT = re.compile(r"0|[1-9][0-9]*")
+_FLOAT = re.compile(r"[0-9]+\.[0-9]+")
+# What YAML reads as a timestamp must also build one, or safe_load raises
+_TIMESTAMP_LIKE = re.compile(r"[0-9]{4}-")
+_TIMESTAMP = re.compile(
+    r"([0-9]{4})-([0-9]{2})-([0-9]{2})"
+    r"(?:T(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](?:\.[0-9]+)?"
+    r"(?:Z|[+-](?:[01][0-9]|2[0-3]):[0-5][0-9])?)?"
+)
+
+
+class _NotPlain(Exception):
+    """Frontmatter outside what _scan_frontmatter reads; YAML must parse it."""
+
+
+def _scan_frontmatter(text: str) -> dict | None:
+    """
+    Read the plain frontmatter most insights use without YAML: "key: value"
+    lines, with flow lists ("[a, b]") as values, and one level of
+    "- item" or "key: value" lines under a key with no value. Values are
+    unquoted or simply quoted scalars; integers and decimals become int
+    and float, as YAML would make them, and everything else stays a
+    string (the checks only type the numeric fields).
+
+    Returns None for anything else (comments, anchors, block scalars,
+    escapes, deeper nesting, ...) so the caller falls back to YAML. The
+    grammar is kept narrow enough that whatever it accepts, YAML parses
+    without error to the same keys, lists and numbers.
+    """
+    if _NOT_PLAIN_TEXT.search(text):
+        return None
+    lines = text.split("\n")
+    if lines[0].strip(" "):
+        return None  # Something after the opening "---"
+    data: dict = {}
+    parent = None  # Key with no value that nested lines may belong to
+    block = None
+    indent = 0
+    try:
+        for line in lines[1:]:
+            line = line.rstrip(" ")
+            if not line:
+                continue
+            if line[0] != " " and not line.startswith("- "):
+                m = _KEY_LINE.fullmatch(line)
+                if m is None:
+                    return None
+                key, value = m.groups()
+                data[key] = None if value is None else _scan_value(value)
+                parent, block = (key if value is None else None), None
+                continue
+
+            if parent is None:
+                return None  # Continuation line: a multi-line scalar
+            rest = line.lstrip(" ")
+            if block is None:
+                if rest.startswith("- "):
+                    block = []
+                elif len(rest) < len(line):
+                    block = {}
+                else:
+                    return None
+                indent = len(line) - len(rest)
+                data[parent] = block
+            elif len(line) - len(rest) != indent:
+                return None
+
+            if isinstance(block, list):
+                if not rest.startswith("- "):
+                    return None
+                block.append(_scan_value(rest[2:].lstrip(" ")))
+            else:
+                m = _KEY_LINE.fullmatch(rest)
+                if m is None or m.group(2) is None:
+                    return None
+                block[m.group(1)] = _scan_value(m.group(2))
+    except _NotPlain:
+        return None
+    return data
+
+
+def _scan_value(value: str, flow: bool = False):
+    """One value for _scan_frontmatter; raises _NotPlain if YAML must decide."""
+    if value[:1] == "[" and not flow:
+        if not value.endswith("]"):
+            raise _NotPlain
+        inner = value[1:-1].strip(" ")
+        if not inner:
+            return []
+        return [_scan_value(item.strip(" "), flow=True) for item in inner.split(",")]
+
+    m = _QUOTED.fullmatch(value)
+    if m is not None:
+        return m.group(1) if m.group(1) is not None else m.group(2)
+    if (
+        not value
+        or value[0] in _INDICATORS
+        or value.endswith(":")
+        or ": " in value
+        or " #" in value
+        or (flow and _FLOW_SPECIAL.search(value))
+    ):
+        raise _NotPlain
+    if _INT.fullmatch(value):
+        return int(value)
+    if _FLOAT.fullmatch(value):
+        return float(value)
+    if _TIMESTAMP_LIKE.match(value):
+        m = _TIMESTAMP.fullmatch(value)
+        if m is None:
+            raise _NotPlain
+        try:
+            date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            raise _NotPlain from None
+    return value
+
+
+def _check_body(content: bytes, start: int) -> list[str]:
+    """
+    Check the body content, content[start:], without copying it. A UTF-8
+    character is at most 4 bytes, so if the first and last non-space bytes
+    are 4 * MIN_BODY_CHARS or more apart the body is long enough; only a
+    shorter body is sliced out, decoded and counted.
+    """
+    limit = 4 * MIN_BODY_CHARS
+    first = _NON_SPACE.search(content, start)
+    if first is None:
+        body = b""
+    elif _NON_SPACE.search(content, first.start() + limit - 1):
+        return []
+    else:
+        # Everything past the slice is ASCII whitespace, so it cannot
+        # split a multi-byte character
+        body = content[first.start():first.start() + limit]
+    text = body.decode("utf-8", errors="replace").replace("\r\n", "\n").strip()
+    if len(text) < MIN_BODY_CHARS:
+        return [f"Insight body is too short (< {MIN_BODY_CHARS} chars). Add more detail."]
+    return []
+
+
+# Below this many files a process pool costs more to start than it saves
+_PARALLEL_MIN_FILES = 16
+
+
+def validate_many(
+    paths: list[str], workers: int | None = None
+) -> list[list[str]]:
+    """
+    Validate several insight files. Returns one error list per path,
+    parallel to paths (duplicates included).
+
+    Large batches are spread over a process pool (workers defaults to the
+    CPU count); small ones, or workers=1, run in this process.
+    """
+    if workers == 1 or len(paths) < _PARALLEL_MIN_FILES:
+        return [validate_insight(path) for path in paths]
+    workers = workers or os.cpu_count() or 1
+    # About four chunks per worker: big enough to amortize the hand-off,
+    # small enough that no worker ends up with most of the batch
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(validate_insight, paths, chunksize=chunksize))
+
+
 def main() -> None:
     if len(sys.argv) < 2:
-        print("Usage: validate.py <insight-file.yaml>")
+        print("Usage: validate.py <insight-file.yaml> [more.yaml ...]")
         sys.exit(1)
 
-    filepath = sys.argv[1]
-    errors = validate_insight(filepath)
-
-    if errors:
-        print(f"INVALID: {filepath}")
-        for err in errors:
-            print(f"  - {err}")
-        sys.exit(1)
-    else:
-        print(f"VALID: {filepath}")
-        sys.exit(0)
+    invalid = False
+    paths = sys.argv[1:]
+    for filepath, errors in zip(paths, validate_many(paths)):
+        if errors:
+            invalid = True
+            print(f"INVALID: {filepath}")
+            for err in errors:
+                print(f"  - {err}")
+        else:
+            print(f"VALID: {filepath}")
+    sys.exit(1 if invalid else 0)
 
 
 if __name__ == "__main__":
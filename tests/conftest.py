@@ -0,0 +1,22 @@
+"""Shared pytest fixtures."""
+
+import os
+
+import pytest
+
+# Most tests live in tmp_path; on Linux, keep those trees in RAM
+_SHM = "/dev/shm"
+
+
+def pytest_configure(config):
+    # Move only pytest's temp root, not basetemp: the numbered, locked
+    # pytest-of-<user>/pytest-N directories keep concurrent runs apart and
+    # the last few runs stay around for post-mortems.
+    if os.access(_SHM, os.W_OK | os.X_OK):
+        os.environ.setdefault("PYTEST_DEBUG_TEMPROOT", _SHM)
+
+
+@pytest.fixture
+def seed_home(tmp_path):
+    """A fresh, empty seed home directory for one test (as a str path)."""
+    return str(tmp_path)
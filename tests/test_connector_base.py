@@ -1,11 +1,21 @@
 """Tests for the connector base class."""
 
+import asyncio
 import json
-import tempfile
+import signal
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch
 
-from connectors.base.connector import Connector
+import pytest
+
+from connectors.base.connector import (
+    _IDLE,
+    _RESCANS_PER_PHASE,
+    Connector,
+    _rescan_delay,
+)
 from connectors.base.message import (
     ConnectorInfo,
     Content,
@@ -42,108 +52,326 @@ class DummyConnector(Connector):
 
 
 class TestConnectorBase:
-    def test_init_creates_directories(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
-            assert (Path(tmpdir) / "messages" / "inbox").is_dir()
-            assert (Path(tmpdir) / "messages" / "outbox" / "test").is_dir()
-            assert (Path(tmpdir) / "messages" / "failed").is_dir()
-            assert (Path(tmpdir) / "logs").is_dir()
-
-    def test_write_to_inbox(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
-            msg = Message(
-                connector=ConnectorInfo(type="dummy", instance="test"),
-                sender=Sender(id="u1", username="user"),
-                content=Content(text="hello"),
+    def test_init_creates_directories(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        assert (Path(seed_home) / "messages" / "inbox").is_dir()
+        assert (Path(seed_home) / "messages" / "outbox" / "test").is_dir()
+        assert (Path(seed_home) / "messages" / "failed").is_dir()
+        assert (Path(seed_home) / "logs").is_dir()
+
+    def test_connector_info_shared_and_frozen(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        assert conn.connector_info == ConnectorInfo(type="dummy", instance="test")
+        with pytest.raises(AttributeError):
+            conn.connector_info.instance = "other"
+
+    def test_handlers_not_stacked_on_reinit(self, seed_home):
+        DummyConnector(name="reinit", seed_home=seed_home)
+        conn = DummyConnector(name="reinit", seed_home=seed_home)
+        assert len(conn.logger.handlers) == 2
+
+    def test_init_leaves_signal_handlers_alone(self, seed_home):
+        before = signal.getsignal(signal.SIGTERM)
+        DummyConnector(name="test", seed_home=seed_home)
+        assert signal.getsignal(signal.SIGTERM) is before
+
+    def test_signal_stops_every_connector(self, seed_home):
+        a = DummyConnector(name="sig-a", seed_home=seed_home)
+        b = DummyConnector(name="sig-b", seed_home=seed_home)
+        Connector._dispatch_signal(signal.SIGTERM, None)
+        assert not a._running
+        assert not b._running
+
+    def test_write_to_inbox(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        msg = Message(
+            connector=ConnectorInfo(type="dummy", instance="test"),
+            sender=Sender(id="u1", username="user"),
+            content=Content(text="hello"),
+            conversation=Conversation(id="c1", type="dm"),
+        )
+        filepath = conn.write_to_inbox(msg)
+        assert filepath.exists()
+
+        data = json.loads(filepath.read_bytes())
+        assert data["content"]["text"] == "hello"
+
+    def test_queue_to_inbox_written_by_flush(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        msgs = [
+            Message(
+                connector=conn.connector_info,
+                sender=Sender(id="u1", username="alice"),
+                content=Content(text=f"queued {i}"),
                 conversation=Conversation(id="c1", type="dm"),
             )
-            filepath = conn.write_to_inbox(msg)
-            assert filepath.exists()
+            for i in range(3)
+        ]
+        assert all(conn.queue_to_inbox(m) for m in msgs)
+        conn._flush_inbox()
+        assert conn._inbox_writer is None
+        texts = sorted(
+            Message.from_file(p).content.text for p in conn.inbox.glob("*.json")
+        )
+        assert texts == ["queued 0", "queued 1", "queued 2"]
+
+    def test_queue_to_inbox_rejects_when_full(self, seed_home):
+        conn = DummyConnector(
+            name="test", seed_home=seed_home, config={"inbox_queue_size": 1}
+        )
+        msg = Message(
+            connector=conn.connector_info,
+            sender=Sender(id="u1", username="alice"),
+            content=Content(text="hi"),
+            conversation=Conversation(id="c1", type="dm"),
+        )
+        with patch.object(DummyConnector, "_start_inbox_writer"):  # Nothing drains
+            assert conn.queue_to_inbox(msg)
+            assert not conn.queue_to_inbox(msg)
+
+    def test_poll_outbox(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+
+        # Write an outgoing message to the outbox
+        out_msg = OutgoingMessage(
+            connector_instance="test",
+            conversation_id="c1",
+            text="response",
+        )
+        out_msg.write_to(conn.outbox)
 
-            data = json.loads(filepath.read_text())
-            assert data["content"]["text"] == "hello"
+        # Poll should return it and delete the file
+        messages = conn.poll_outbox()
+        assert len(messages) == 1
+        assert messages[0].text == "response"
 
-    def test_poll_outbox(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
+        # File should be deleted
+        assert len(list(conn.outbox.glob("*.json"))) == 0
 
-            # Write an outgoing message to the outbox
-            out_msg = OutgoingMessage(
+    def test_poll_outbox_name_order_skips_other_files(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        for name, text in [("out_2.json", "second"), ("out_1.json", "first")]:
+            (conn.outbox / name).write_text(OutgoingMessage(
+                connector_instance="test", conversation_id="c1", text=text,
+            ).to_json())
+        (conn.outbox / "notes.txt").write_text("ignore me")
+
+        messages = conn.poll_outbox()
+        assert [m.text for m in messages] == ["first", "second"]
+        assert (conn.outbox / "notes.txt").exists()
+
+    def test_poll_outbox_ignores_write_in_progress(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        # What write_to leaves behind mid-write, before the os.replace
+        partial = conn.outbox / ".out_1.json.tmp"
+        partial.write_text('{"connector_instance": "te')
+
+        assert conn.poll_outbox() == []
+        assert partial.exists()
+        assert not any(conn.failed.iterdir())
+
+    def test_poll_outbox_mixed_sizes(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        texts = ["short", "x" * 200_000, "after"]
+        for i, text in enumerate(texts):
+            (conn.outbox / f"out_{i}.json").write_text(OutgoingMessage(
+                connector_instance="test", conversation_id="c1", text=text,
+            ).to_json())
+
+        messages = conn.poll_outbox()
+        assert [m.text for m in messages] == texts
+        assert len(list(conn.outbox.glob("*.json"))) == 0
+
+    def test_process_outbox(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+
+        # Write two outgoing messages
+        for text in ["msg1", "msg2"]:
+            OutgoingMessage(
                 connector_instance="test",
                 conversation_id="c1",
-                text="response",
-            )
-            out_msg.write_to(conn.outbox)
+                text=text,
+            ).write_to(conn.outbox)
+
+        sent = conn.process_outbox()
+        assert sent == 2
+        assert len(conn.sent_messages) == 2
+
+    def test_poll_outbox_loop_delivers(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        poller = threading.Thread(
+            target=conn._poll_outbox_loop, args=(0.2,), daemon=True
+        )
+        poller.start()
+
+        OutgoingMessage(
+            connector_instance="test",
+            conversation_id="c1",
+            text="later",
+        ).write_to(conn.outbox)
 
-            # Poll should return it and delete the file
-            messages = conn.poll_outbox()
-            assert len(messages) == 1
-            assert messages[0].text == "response"
+        deadline = time.monotonic() + 5
+        while not conn.sent_messages and time.monotonic() < deadline:
+            time.sleep(0.01)
+        conn._running = False
+        poller.join(timeout=5)
 
-            # File should be deleted
-            assert len(list(conn.outbox.glob("*.json"))) == 0
+        assert [m.text for m in conn.sent_messages] == ["later"]
 
-    def test_process_outbox(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
+    def test_stop_interrupts_poll_outbox_loop(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        poller = threading.Thread(
+            target=conn._poll_outbox_loop, args=(60.0,), daemon=True
+        )
+        poller.start()
+        time.sleep(0.1)  # Let it block in the 60s wait
 
-            # Write two outgoing messages
-            for text in ["msg1", "msg2"]:
+        start = time.monotonic()
+        conn.stop()
+        poller.join(timeout=5)
+        assert not poller.is_alive()
+        assert time.monotonic() - start < 2.0
+        assert not conn._running
+
+    def test_outbox_fallback_wakes_on_notify_and_rescans_fast(self, seed_home):
+        with patch("connectors.base.watcher._load_libc", return_value=None):
+            conn = DummyConnector(name="test", seed_home=seed_home)
+            t = threading.Thread(target=conn._poll_outbox_loop, args=(30.0,))
+            t.start()
+            try:
+                while conn._outbox_watcher is None:
+                    time.sleep(0.01)
+                conn.write_to_outbox(OutgoingMessage(
+                    connector_instance="test", conversation_id="c1", text="now",
+                ))
+                deadline = time.monotonic() + 5
+                while not conn.sent_messages and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert [m.text for m in conn.sent_messages] == ["now"]
+
+                # Right after a send the fallback rescans fast, so even an
+                # un-notified write goes out long before the 30s interval
                 OutgoingMessage(
-                    connector_instance="test",
-                    conversation_id="c1",
-                    text=text,
+                    connector_instance="test", conversation_id="c1", text="next",
                 ).write_to(conn.outbox)
+                deadline = time.monotonic() + 5
+                while len(conn.sent_messages) < 2 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert [m.text for m in conn.sent_messages] == ["now", "next"]
+            finally:
+                conn.stop()
+                t.join(timeout=5)
+            assert not t.is_alive()
 
-            sent = conn.process_outbox()
-            assert sent == 2
-            assert len(conn.sent_messages) == 2
+    def test_rescan_delay_backs_off_to_interval(self):
+        delays = [_rescan_delay(idle, 2.0) for idle in range(_IDLE + 2)]
+        assert delays[0] < delays[_RESCANS_PER_PHASE] < delays[-1] == 2.0
+        assert delays == sorted(delays)
+        assert _rescan_delay(0, 0.01) == 0.01  # Never slower than interval
 
-    def test_get_config_from_dict(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(
-                name="test",
-                seed_home=tmpdir,
-                config={"key1": "value1", "key2": "value2"},
-            )
-            assert conn.get_config("key1") == "value1"
-            assert conn.get_config("missing", "default") == "default"
-
-    def test_get_config_env_expansion(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(
-                name="test",
-                seed_home=tmpdir,
-                config={"token": "${TEST_SEED_TOKEN}"},
-            )
-            with patch.dict("os.environ", {"TEST_SEED_TOKEN": "secret123"}):
-                assert conn.get_config("token") == "secret123"
-
-    def test_get_config_env_key(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
-            with patch.dict("os.environ", {"MY_TOKEN": "from_env"}):
-                assert conn.get_config("missing", env_key="MY_TOKEN") == "from_env"
-
-    def test_run_lifecycle(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
-            conn.run()
-            assert conn.connected
-            assert conn.disconnected
-
-    def test_bad_outbox_file(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            conn = DummyConnector(name="test", seed_home=tmpdir)
-
-            # Write invalid JSON to outbox
-            bad_file = conn.outbox / "bad.json"
-            bad_file.write_text("not json")
-
-            messages = conn.poll_outbox()
-            assert len(messages) == 0
-
-            # Should be moved to failed
-            assert (conn.failed / "bad.json").exists()
+    def test_async_outbox_loop_delivers_and_stops(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        sent = []
+
+        async def async_send(msg):
+            await asyncio.sleep(0.001)
+            sent.append((msg.conversation_id, msg.text))
+            return True
+
+        conn._async_send = async_send
+        for i in range(3):
+            for cid in ["a", "b"]:
+                OutgoingMessage(
+                    connector_instance="test", conversation_id=cid, text=f"{cid}{i}",
+                ).write_to(conn.outbox)
+
+        async def scenario():
+            task = asyncio.create_task(conn._async_outbox_loop(60.0))
+            while len(sent) < 6:
+                await asyncio.sleep(0.01)
+            conn.stop()
+            await asyncio.wait_for(task, 2.0)
+
+        asyncio.run(scenario())
+        for cid in ["a", "b"]:
+            assert [t for c, t in sent if c == cid] == [f"{cid}0", f"{cid}1", f"{cid}2"]
+
+    def test_process_outbox_keeps_conversation_order(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        for i in range(6):
+            (conn.outbox / f"out_{i}.json").write_text(OutgoingMessage(
+                connector_instance="test",
+                conversation_id=f"c{i % 2}",
+                text=str(i),
+            ).to_json())
+
+        sent = conn.process_outbox()
+        assert sent == 6
+        by_conv = {}
+        for m in conn.sent_messages:
+            by_conv.setdefault(m.conversation_id, []).append(m.text)
+        assert by_conv == {"c0": ["0", "2", "4"], "c1": ["1", "3", "5"]}
+
+    def test_get_config_from_dict(self, seed_home):
+        conn = DummyConnector(
+            name="test",
+            seed_home=seed_home,
+            config={"key1": "value1", "key2": "value2"},
+        )
+        assert conn.get_config("key1") == "value1"
+        assert conn.get_config("missing", "default") == "default"
+
+    def test_get_config_env_expansion(self, seed_home, monkeypatch):
+        conn = DummyConnector(
+            name="test",
+            seed_home=seed_home,
+            config={"token": "${TEST_SEED_TOKEN}"},
+        )
+        monkeypatch.setenv("TEST_SEED_TOKEN", "secret123")
+        assert conn.get_config("token") == "secret123"
+
+    def test_get_config_env_expansion_unset(self, seed_home, monkeypatch):
+        conn = DummyConnector(
+            name="test",
+            seed_home=seed_home,
+            config={"token": "${TEST_SEED_UNSET_TOKEN}"},
+        )
+        monkeypatch.delenv("TEST_SEED_UNSET_TOKEN", raising=False)
+        assert conn.get_config("token", "fallback") == "fallback"
+        monkeypatch.setenv("TEST_SEED_UNSET_TOKEN", "late")
+        assert conn.get_config("token") == "late"
+
+    def test_get_config_env_key(self, seed_home, monkeypatch):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        monkeypatch.setenv("MY_TOKEN", "from_env")
+        assert conn.get_config("missing", env_key="MY_TOKEN") == "from_env"
+
+    def test_get_id_config_skips_non_numeric(self, seed_home, caplog):
+        conn = DummyConnector(
+            name="test",
+            seed_home=seed_home,
+            config={"chats": [123, "-456", "@mychannel", "${CHAT_ID}"]},
+        )
+        with caplog.at_level("WARNING", logger="connector.test"):
+            assert conn.get_id_config("chats") == frozenset({123, -456})
+        assert "'@mychannel'" in caplog.text
+        assert conn.get_id_config("missing") == frozenset()
+
+    def test_run_lifecycle(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+        conn.run()
+        assert conn.connected
+        assert conn.disconnected
+
+    def test_bad_outbox_file(self, seed_home):
+        conn = DummyConnector(name="test", seed_home=seed_home)
+
+        # Write invalid JSON to outbox
+        bad_file = conn.outbox / "bad.json"
+        bad_file.write_text("not json")
+
+        messages = conn.poll_outbox()
+        assert len(messages) == 0
+
+        # Should be moved to failed
+        assert (conn.failed / "bad.json").exists()
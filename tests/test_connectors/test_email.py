@@ -0,0 +1,274 @@
+"""Tests for the email connector."""
+
+import smtplib
+import socket
+import tempfile
+import threading
+import time
+from email import policy
+from email.parser import BytesHeaderParser
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from connectors.base.message import Message, OutgoingMessage
+from connectors.email.connector import (
+    EmailConnector,
+    _find_text_part,
+    _html_to_text,
+    _parse_imap_list,
+)
+
+
+class _FakeIMAP:
+    """Just enough of imaplib.IMAP4 for EmailConnector._idle."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.tagged_commands = {}
+
+    def _new_tag(self):
+        tag = b"A001"
+        self.tagged_commands[tag] = None
+        return tag
+
+
+def _serve_idle(server, lines_after_continuation):
+    """Fake IMAP server side of one IDLE exchange."""
+    f = server.makefile("rb")
+    assert f.readline() == b"A001 IDLE\r\n"
+    server.sendall(b"+ idling\r\n" + b"".join(lines_after_continuation))
+    assert f.readline() == b"DONE\r\n"
+    server.sendall(b"A001 OK IDLE terminated\r\n")
+
+
+def _smtp_connector(tmpdir):
+    conn = EmailConnector(name="email-test", seed_home=tmpdir)
+    conn._smtp_host, conn._smtp_port = "smtp.example.com", 587
+    conn._username, conn._password = "bot@example.com", "secret"
+    conn._from_header = "bot@example.com"
+    conn._smtp_idle = []
+    conn._smtp_lock = threading.Lock()
+    conn._smtp_slots = threading.BoundedSemaphore(4)
+    return conn
+
+
+def _outgoing(text):
+    return OutgoingMessage(
+        connector_instance="email-test",
+        conversation_id="user@example.com",
+        text=text,
+    )
+
+
+class TestEmailConnector:
+    def test_connector_type(self):
+        assert EmailConnector.connector_type == "email"
+
+    def test_idle_returns_on_exists(self):
+        client, server = socket.socketpair()
+        with client, server, tempfile.TemporaryDirectory() as tmpdir:
+            conn = EmailConnector(name="email-test", seed_home=tmpdir)
+            conn._imap = _FakeIMAP(client)
+            t = threading.Thread(
+                target=_serve_idle, args=(server, [b"* 4 EXISTS\r\n"])
+            )
+            t.start()
+            assert conn._idle(timeout=10.0) is True
+            t.join(timeout=5)
+            assert conn._imap.tagged_commands == {}
+
+    def test_idle_times_out_without_mail(self):
+        client, server = socket.socketpair()
+        with client, server, tempfile.TemporaryDirectory() as tmpdir:
+            conn = EmailConnector(name="email-test", seed_home=tmpdir)
+            conn._imap = _FakeIMAP(client)
+            t = threading.Thread(target=_serve_idle, args=(server, []))
+            t.start()
+            assert conn._idle(timeout=0.2) is False
+            t.join(timeout=5)
+
+    def test_smtp_session_reused_across_sends(self):
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch("connectors.email.connector.smtplib.SMTP") as smtp_cls:
+            conn = _smtp_connector(tmpdir)
+            assert conn.send_message(_outgoing("one"))
+            assert conn.send_message(_outgoing("two"))
+            assert smtp_cls.call_count == 1
+            assert smtp_cls.return_value.login.call_count == 1
+            assert smtp_cls.return_value.send_message.call_count == 2
+            sent = smtp_cls.return_value.send_message.call_args.args[0]
+            assert sent["From"] == "bot@example.com"
+            assert sent["To"] == "user@example.com"
+            assert sent.get_content().strip() == "two"
+
+    def test_smtp_reconnects_once_after_disconnect(self):
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch("connectors.email.connector.smtplib.SMTP") as smtp_cls:
+            stale, fresh = MagicMock(), MagicMock()
+            stale.send_message.side_effect = smtplib.SMTPServerDisconnected()
+            smtp_cls.side_effect = [stale, fresh]
+
+            conn = _smtp_connector(tmpdir)
+            assert conn.send_message(_outgoing("hello"))
+            assert fresh.send_message.call_count == 1
+            assert conn._smtp_idle[0][0] is fresh
+            assert stale.quit.called
+
+    def test_concurrent_sends_use_separate_sessions(self):
+        release = threading.Event()
+        sessions = []
+
+        def new_session(*args):
+            server = MagicMock()
+            if not sessions:  # First session blocks until the second has sent
+                server.send_message.side_effect = lambda m: release.wait(5)
+            sessions.append(server)
+            return server
+
+        with tempfile.TemporaryDirectory() as tmpdir, \
+                patch("connectors.email.connector.smtplib.SMTP", side_effect=new_session):
+            conn = _smtp_connector(tmpdir)
+            t = threading.Thread(target=conn.send_message, args=(_outgoing("slow"),))
+            t.start()
+            while not sessions:
+                time.sleep(0.01)
+            assert conn.send_message(_outgoing("fast"))
+            release.set()
+            t.join(timeout=5)
+
+            assert len(sessions) == 2
+            assert {s for s, _ in conn._smtp_idle} == set(sessions)
+
+    def test_check_mail_fetches_only_text_parts(self):
+        hdr7 = b"From: Ann <ann@example.com>\r\nSubject: report\r\n\r\n"
+        hdr9 = b"From: bob@example.com\r\nSubject: hi\r\n\r\n"
+        imap = MagicMock()
+        imap.uid.side_effect = [
+            ("OK", [b"7 9"]),
+            ("OK", [
+                b'1 (UID 7 BODYSTRUCTURE (("TEXT" "PLAIN" ("CHARSET" "utf-8") NIL NIL '
+                b'"QUOTED-PRINTABLE" 12 1 NIL NIL NIL)("APPLICATION" "PDF" ("NAME" "a.pdf") '
+                b'NIL NIL "BASE64" 50000 NIL ("ATTACHMENT" ("FILENAME" "a.pdf")) NIL) '
+                b'"MIXED" ("BOUNDARY" "xyz") NIL NIL))',
+                b'2 (UID 9 BODYSTRUCTURE ("TEXT" "PLAIN" ("CHARSET" "us-ascii") NIL NIL '
+                b'"7BIT" 6 1 NIL NIL NIL))',
+            ]),
+            ("OK", [
+                (b"1 (UID 7 BODY[HEADER] {%d}" % len(hdr7), hdr7),
+                (b" BODY[1] {12}", b"caf=C3=A9 ok"),
+                b")",
+                (b"2 (UID 9 BODY[HEADER] {%d}" % len(hdr9), hdr9),
+                (b" BODY[1] {6}", b"hello\n"),
+                b")",
+            ]),
+            ("OK", [b"1 (FLAGS (\\Seen))", b"2 (FLAGS (\\Seen))"]),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = EmailConnector(name="email-test", seed_home=tmpdir)
+            conn._imap = imap
+            conn._folders = ["INBOX"]
+            conn._allowed_senders = frozenset()
+            conn._check_mail()
+
+            calls = [c.args for c in imap.uid.call_args_list]
+            assert calls[1] == ("FETCH", "7,9", "(BODYSTRUCTURE)")
+            assert calls[2] == ("FETCH", "7,9", "(BODY.PEEK[HEADER] BODY.PEEK[1])")
+            assert calls[3] == ("STORE", "7,9", "+FLAGS", "(\\Seen)")
+            msgs = sorted(
+                (Message.from_file(p) for p in conn.inbox.glob("*.json")),
+                key=lambda m: m.sender.id,
+            )
+            assert [(m.sender.id, m.content.text) for m in msgs] == [
+                ("ann@example.com", "caf\u00e9 ok"),
+                ("bob@example.com", "hello"),
+            ]
+            assert msgs[0].metadata["subject"] == "report"
+
+    def test_check_mail_marks_processed_uids_when_one_fails(self):
+        hdr = b"From: ann@example.com\r\nSubject: hi\r\n\r\n"
+        imap = MagicMock()
+        imap.uid.side_effect = [
+            ("OK", [b"7 9"]),
+            ("OK", [
+                b'1 (UID 7 BODYSTRUCTURE ("TEXT" "PLAIN" ("CHARSET" "us-ascii") NIL NIL '
+                b'"7BIT" 3 1 NIL NIL NIL))',
+                b'2 (UID 9 BODYSTRUCTURE ("TEXT" "PLAIN" ("CHARSET" "us-ascii") NIL NIL '
+                b'"7BIT" 3 1 NIL NIL NIL))',
+            ]),
+            ("OK", [
+                (b"1 (UID 7 BODY[HEADER] {%d}" % len(hdr), hdr),
+                (b" BODY[1] {3}", b"one"),
+                b")",
+                (b"2 (UID 9 BODY[HEADER] {%d}" % len(hdr), hdr),
+                (b" BODY[1] {3}", b"two"),
+                b")",
+            ]),
+            ("OK", [b"1 (FLAGS (\\Seen))"]),
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = EmailConnector(name="email-test", seed_home=tmpdir)
+            conn._imap = imap
+            conn._folders = ["INBOX"]
+            conn._allowed_senders = frozenset()
+            process = conn._process_email
+            seen = []
+
+            def flaky(headers, body):
+                seen.append(body)
+                if len(seen) == 2:
+                    raise RuntimeError("boom")
+                process(headers, body)
+
+            conn._process_email = flaky
+            with pytest.raises(RuntimeError):
+                conn._check_mail()
+
+            calls = [c.args for c in imap.uid.call_args_list]
+            assert calls[-1] == ("STORE", "7", "+FLAGS", "(\\Seen)")
+            assert len(list(conn.inbox.glob("*.json"))) == 1
+
+    def test_find_text_part_in_nested_multipart(self):
+        structure = _parse_imap_list(
+            b'((("TEXT" "PLAIN" ("CHARSET" "iso-8859-1") NIL NIL "BASE64" 8 1 NIL NIL NIL)'
+            b'("TEXT" "HTML" NIL NIL NIL "7BIT" 20 1 NIL NIL NIL) "ALTERNATIVE")'
+            b'("IMAGE" "PNG" NIL NIL NIL "BASE64" 900 NIL NIL NIL) "MIXED")'
+        )[0]
+        assert _find_text_part(structure) == ("1.1", b"base64", "iso-8859-1")
+        assert _find_text_part(structure, b"html") == ("1.2", b"7bit", None)
+
+    def test_find_text_part_skips_attached_messages(self):
+        structure = _parse_imap_list(
+            b'(("TEXT" "HTML" ("CHARSET" "utf-8") NIL NIL "7BIT" 30 1 NIL NIL NIL)'
+            b'("MESSAGE" "RFC822" NIL NIL NIL "7BIT" 200 (NIL "fwd" NIL NIL NIL NIL '
+            b'NIL NIL NIL NIL) ("TEXT" "PLAIN" NIL NIL NIL "7BIT" 5 1 NIL NIL NIL) 8 '
+            b'NIL NIL NIL) "MIXED")'
+        )[0]
+        assert _find_text_part(structure) is None
+        assert _find_text_part(structure, b"html") == ("1", b"7bit", "utf-8")
+
+    def test_html_to_text(self):
+        html = (
+            "<html><head><style>p {color: red}</style></head><body>"
+            "<p>Hello&nbsp;<b>there</b></p><div>a &amp; b</div>"
+            "<script>ignored()</script>line<br>break</body></html>"
+        )
+        assert _html_to_text(html) == "Hello there\na & b\nline\nbreak"
+
+    def test_process_email_decodes_structured_headers(self):
+        headers = BytesHeaderParser(policy=policy.default).parsebytes(
+            b"From: =?utf-8?q?Jos=C3=A9?= <jose@example.com>\r\n"
+            b"Subject: =?utf-8?q?caf=C3=A9?=\r\n"
+            b"Message-ID: <abc@example.com>\r\n\r\n"
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = EmailConnector(name="email-test", seed_home=tmpdir)
+            conn._allowed_senders = frozenset()
+            conn._process_email(headers, "hi\n")
+
+            (path,) = conn.inbox.glob("*.json")
+            msg = Message.from_file(path)
+            assert msg.sender.id == "jose@example.com"
+            assert msg.sender.display_name == "José"
+            assert msg.conversation.thread_id == "<abc@example.com>"
+            assert msg.metadata["subject"] == "café"
@@ -1,6 +1,9 @@
 """Tests for the ConnectorManager."""
 
+import signal
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import yaml
@@ -23,6 +26,14 @@ class TestConnectorManager:
             assert manager.connectors[0]["name"] == "cli-test"
             assert manager.connectors[0]["type"] == "cli"
 
+    def test_from_empty_config(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "connectors.yml"
+            config_path.write_text("")
+
+            manager = ConnectorManager.from_config(config_path, seed_home=tmpdir)
+            assert manager.connectors == []
+
     def test_add_connector(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             manager = ConnectorManager(seed_home=tmpdir)
@@ -39,3 +50,25 @@ class TestConnectorManager:
             manager = ConnectorManager(seed_home=tmpdir)
             status = manager.status()
             assert status == {}
+
+    def test_monitor_skips_missing_deps_and_wakes_on_signal(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = ConnectorManager(seed_home=tmpdir)
+            manager.add_connector("ghost", "no_such_connector_module")
+            manager._shutdown = lambda: None  # Nothing left to stop
+
+            timer = threading.Timer(
+                1.0, manager._handle_signal, args=(signal.SIGTERM, None)
+            )
+            saved = signal.getsignal(signal.SIGTERM), signal.getsignal(signal.SIGINT)
+            timer.start()
+            start = time.monotonic()
+            try:
+                manager.start(restart_delay=0)
+            finally:
+                timer.cancel()
+                signal.signal(signal.SIGTERM, saved[0])
+                signal.signal(signal.SIGINT, saved[1])
+
+            assert manager.processes["ghost"].exitcode == 2
+            assert time.monotonic() - start < 5.0
@@ -0,0 +1,89 @@
+"""Tests for the webhook connector."""
+
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from connectors.webhook.connector import (
+    WebhookConnector,
+    _ConnectionPool,
+    _PendingResponses,
+)
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    connections = set()
+    bodies = []
+
+    def do_POST(self):
+        _CallbackHandler.connections.add(self.client_address)
+        _CallbackHandler.bodies.append(self.rfile.read(int(self.headers["Content-Length"])))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestWebhookConnector:
+    def test_connector_type(self):
+        assert WebhookConnector.connector_type == "webhook"
+
+    def test_verify_secret(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = WebhookConnector(name="webhook-test", seed_home=tmpdir)
+            conn._secret_bytes = "s3crét".encode("utf-8")
+            assert conn._verify_secret("s3crét")
+            assert not conn._verify_secret("s3cret")
+            assert not conn._verify_secret("")
+            assert not conn._verify_secret(None)
+
+    def test_verify_secret_not_configured(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            conn = WebhookConnector(name="webhook-test", seed_home=tmpdir)
+            conn._secret_bytes = None
+            assert conn._verify_secret(None)
+
+
+class TestConnectionPool:
+    def test_reuses_connection_across_posts(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _CallbackHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        pool = _ConnectionPool()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/cb?x=1"
+            for i in range(3):
+                assert pool.post_json(url, b'{"text": "%d"}' % i) == 200
+            assert len(_CallbackHandler.connections) == 1
+            assert _CallbackHandler.bodies == [b'{"text": "0"}', b'{"text": "1"}', b'{"text": "2"}']
+        finally:
+            pool.close()
+            server.shutdown()
+            server.server_close()
+
+
+class TestPendingResponses:
+    def test_pop_returns_once(self):
+        pending = _PendingResponses()
+        pending["c1"] = "hello"
+        assert pending.pop("c1") == "hello"
+        assert pending.pop("c1") is None
+
+    def test_bounded(self):
+        pending = _PendingResponses(maxsize=2)
+        for cid in ["a", "b", "c"]:
+            pending[cid] = cid
+        assert len(pending) == 2
+        assert pending.pop("a") is None
+        assert pending.pop("c") == "c"
+
+    def test_expires(self):
+        with patch("connectors.webhook.connector.time.monotonic", return_value=100.0):
+            pending = _PendingResponses(ttl=10)
+            pending["c1"] = "old"
+        with patch("connectors.webhook.connector.time.monotonic", return_value=111.0):
+            assert pending.pop("c1") is None
+            assert len(pending) == 0
@@ -1,40 +1,52 @@
 """Tests that all connectors can be imported regardless of optional deps."""
 
-import importlib
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).parent.parent
+
+CONNECTORS = [
+    ("connectors.slack.connector", "SlackConnector", "slack"),
+    ("connectors.discord.connector", "DiscordConnector", "discord"),
+    ("connectors.telegram.connector", "TelegramConnector", "telegram"),
+    ("connectors.webhook.connector", "WebhookConnector", "webhook"),
+    ("connectors.cli.connector", "CLIConnector", "cli"),
+    ("connectors.email.connector", "EmailConnector", "email"),
+]
+
+OPTIONAL_DEPS = [
+    "slack_bolt", "discord", "telegram", "flask", "waitress", "msgspec", "orjson",
+]
+
+# Runs in a fresh interpreter, so nothing is already in sys.modules, with
+# every optional dependency made unimportable whether installed or not
+_PROBE = """
+import importlib, importlib.abc, sys
+
+class _Block(importlib.abc.MetaPathFinder):
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] in {deps!r}:
+            raise ImportError(f"blocked: {{name}}")
+
+sys.meta_path.insert(0, _Block())
+for mod_path, cls_name, _ in {connectors!r}:
+    print(getattr(importlib.import_module(mod_path), cls_name).connector_type)
+"""
 
 
 class TestImportSafety:
     """All connector modules must import without their optional deps installed."""
 
-    def test_import_slack(self):
-        mod = importlib.import_module("connectors.slack.connector")
-        assert hasattr(mod, "SlackConnector")
-        assert mod.SlackConnector.connector_type == "slack"
-
-    def test_import_discord(self):
-        mod = importlib.import_module("connectors.discord.connector")
-        assert hasattr(mod, "DiscordConnector")
-        assert mod.DiscordConnector.connector_type == "discord"
-
-    def test_import_telegram(self):
-        mod = importlib.import_module("connectors.telegram.connector")
-        assert hasattr(mod, "TelegramConnector")
-        assert mod.TelegramConnector.connector_type == "telegram"
-
-    def test_import_webhook(self):
-        mod = importlib.import_module("connectors.webhook.connector")
-        assert hasattr(mod, "WebhookConnector")
-        assert mod.WebhookConnector.connector_type == "webhook"
-
-    def test_import_cli(self):
-        mod = importlib.import_module("connectors.cli.connector")
-        assert hasattr(mod, "CLIConnector")
-        assert mod.CLIConnector.connector_type == "cli"
-
-    def test_import_email(self):
-        mod = importlib.import_module("connectors.email.connector")
-        assert hasattr(mod, "EmailConnector")
-        assert mod.EmailConnector.connector_type == "email"
+    def test_import_without_optional_deps(self):
+        # One interpreter for all six: the isolation is per run, not per module
+        probe = _PROBE.format(deps=set(OPTIONAL_DEPS), connectors=CONNECTORS)
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=REPO_ROOT,
+            capture_output=True, timeout=60,
+        )
+        assert result.returncode == 0, result.stderr.decode(errors="replace")
+        assert result.stdout.split() == [c[2].encode() for c in CONNECTORS]
 
     def test_import_base(self):
         from connectors.base.connector import Connector
@@ -1,8 +1,9 @@
 """Tests for the standard message format."""
 
 import json
-import tempfile
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+import pytest
 
 from connectors.base.message import (
     ConnectorInfo,
@@ -33,7 +34,25 @@ class TestMessage:
         assert msg.sender.username == "testuser"
         assert msg.content.text == "hello world"
         assert msg.conversation.id == "c1"
-        assert msg.id  # UUID generated
+        assert msg.id  # ID generated
+
+    def test_ids_unique_and_time_ordered(self):
+        ids = [_make_message().id for _ in range(1000)]
+        assert len(set(ids)) == len(ids)
+        assert all(len(i) == 32 for i in ids)
+        stamps = [i[:16] for i in ids]
+        assert stamps == sorted(stamps)
+
+    def test_timestamp_is_utc_iso(self):
+        msg = _make_message()
+        ts = datetime.fromisoformat(msg.timestamp)
+        assert ts.utcoffset() == timedelta(0)
+        assert abs(datetime.now(timezone.utc) - ts) < timedelta(seconds=5)
+
+    def test_slotted(self):
+        msg = _make_message()
+        assert not hasattr(msg, "__dict__")
+        assert not hasattr(msg.content, "__dict__")
 
     def test_to_dict(self):
         msg = _make_message()
@@ -57,22 +76,70 @@ class TestMessage:
         assert restored.connector.type == msg.connector.type
         assert restored.sender.id == msg.sender.id
 
+    def test_from_dict_minimal(self):
+        restored = Message.from_dict({
+            "connector": {"type": "cli", "instance": "cli"},
+            "sender": {"id": "u1", "username": "user"},
+            "content": {"text": "hi"},
+            "conversation": {"id": "c1"},
+        })
+        assert restored.version == "1.0"
+        assert restored.id
+        assert restored.sender.display_name == ""
+        assert restored.content.media_type == "text"
+        assert restored.content.attachments == []
+        assert restored.conversation.type == "channel"
+        assert restored.conversation.thread_id is None
+        assert restored.metadata == {}
+
     def test_from_json(self):
         msg = _make_message()
         j = msg.to_json()
         restored = Message.from_json(j)
         assert restored.content.text == "hello world"
 
-    def test_write_and_read(self):
+    def test_write_and_read(self, tmp_path):
         msg = _make_message()
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = msg.write_to(Path(tmpdir))
-            assert filepath.exists()
-            assert filepath.suffix == ".json"
+        filepath = msg.write_to(tmp_path)
+        assert filepath.exists()
+        assert filepath.suffix == ".json"
 
-            restored = Message.from_file(filepath)
-            assert restored.content.text == "hello world"
-            assert restored.connector.instance == "test-1"
+        restored = Message.from_file(filepath)
+        assert restored.content.text == "hello world"
+        assert restored.connector.instance == "test-1"
+
+    def test_write_leaves_no_temp_files(self, tmp_path):
+        msg = _make_message()
+        filepath = msg.write_to(tmp_path)
+        assert [p.name for p in tmp_path.iterdir()] == [filepath.name]
+
+    def test_back_to_back_writes_keep_order(self, tmp_path):
+        # Faster than the clock ticks: names must still be unique and ordered
+        paths = [
+            _make_message(content=Content(text=str(i))).write_to(tmp_path)
+            for i in range(200)
+        ]
+        assert len({p.name for p in paths}) == 200
+        assert sorted(paths) == paths
+
+    def test_write_creates_missing_directory(self, tmp_path):
+        msg = _make_message()
+        filepath = msg.write_to(tmp_path / "a" / "b")
+        assert filepath.parent == tmp_path / "a" / "b"
+        assert Message.from_file(filepath).content.text == "hello world"
+
+    def test_write_and_read_unicode(self, tmp_path):
+        msg = _make_message(content=Content(text="héllo — 世界"))
+        filepath = msg.write_to(tmp_path)
+        restored = Message.from_file(filepath)
+        assert restored.content.text == "héllo — 世界"
+
+    def test_write_and_read_large(self, tmp_path):
+        # Larger than a single read chunk
+        msg = _make_message(content=Content(text="x" * 200_000))
+        filepath = msg.write_to(tmp_path)
+        restored = Message.from_file(filepath)
+        assert len(restored.content.text) == 200_000
 
     def test_metadata(self):
         msg = _make_message(metadata={"priority": "high", "source": "test"})
@@ -106,7 +173,7 @@ class TestOutgoingMessage:
         )
         assert msg.connector_instance == "slack-main"
         assert msg.text == "response text"
-        assert msg.id  # UUID generated
+        assert msg.id  # ID generated
 
     def test_to_json(self):
         msg = OutgoingMessage(
@@ -120,19 +187,44 @@ class TestOutgoingMessage:
         assert parsed["connector_instance"] == "slack-main"
         assert parsed["thread_id"] == "t456"
 
-    def test_write_and_read(self):
+    def test_from_json_bytes(self):
+        msg = OutgoingMessage(
+            connector_instance="test",
+            conversation_id="c1",
+            text="bytes",
+        )
+        restored = OutgoingMessage.from_json(msg.to_json().encode())
+        assert restored.text == "bytes"
+        assert restored.id == msg.id
+
+    def test_from_json_matches_from_dict(self):
+        # The typed decoder (with msgspec) and the dict path must agree,
+        # including on off-schema types the typed decoder rejects
+        docs = [
+            {"connector_instance": "t", "conversation_id": "c1", "text": "hi", "id": "x"},
+            {"connector_instance": "t", "conversation_id": 123, "text": "hi", "id": "x"},
+            {"connector_instance": "t", "conversation_id": "c1", "text": "hi",
+             "metadata": None, "thread_id": "t1", "id": "x"},
+        ]
+        for doc in docs:
+            assert OutgoingMessage.from_json(json.dumps(doc)) == OutgoingMessage.from_dict(doc)
+
+    def test_from_json_missing_field(self):
+        with pytest.raises(KeyError):
+            OutgoingMessage.from_json(b'{"connector_instance": "t"}')
+
+    def test_write_and_read(self, tmp_path):
         msg = OutgoingMessage(
             connector_instance="test",
             conversation_id="c1",
             text="outgoing",
         )
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = msg.write_to(Path(tmpdir))
-            assert filepath.exists()
+        filepath = msg.write_to(tmp_path)
+        assert filepath.exists()
 
-            restored = OutgoingMessage.from_file(filepath)
-            assert restored.text == "outgoing"
-            assert restored.conversation_id == "c1"
+        restored = OutgoingMessage.from_file(filepath)
+        assert restored.text == "outgoing"
+        assert restored.conversation_id == "c1"
 
     def test_metadata(self):
         msg = OutgoingMessage(
@@ -1,112 +1,234 @@
 """Tests for the insight validator."""
 
-import tempfile
+import os
+import subprocess
+import sys
+import time
 from pathlib import Path
+from unittest.mock import patch
 
-# Import directly since it's a standalone script
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "network" / "tools"))
-from validate import validate_insight
+import pytest
+import yaml
 
+from network.tools import validate
+from network.tools.validate import validate_insight, validate_insight_text, validate_many
 
-def _write_insight(tmpdir, content):
-    path = Path(tmpdir) / "test-insight.yaml"
-    path.write_text(content)
-    return str(path)
+REPO_EXAMPLES = Path(__file__).parent.parent / "network" / "examples"
 
 
-class TestValidateInsight:
-    def test_valid_insight(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = _write_insight(tmpdir, """---
-id: test-001
-title: "Test insight"
-domain: operations
-tags: [test, validation]
-confidence: 0.8
-source_seed: test-seed
-timestamp: 2026-02-10T00:00:00Z
-version: 1
-evidence:
-  - "Test evidence one"
-  - "Test evidence two"
----
+def _write_insight(directory, content):
+    path = directory / "test-insight.yaml"
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
 
+# Raw YAML for each frontmatter value, so tests control the exact literal
+# (1 vs 1.0, quoted vs plain). Values starting with a newline are blocks.
+_BASE_FRONTMATTER = {
+    "id": "test-001",
+    "title": '"Test insight"',
+    "domain": "operations",
+    "tags": "[test, validation]",
+    "confidence": "0.8",
+    "source_seed": "test-seed",
+    "timestamp": "2026-02-10T00:00:00Z",
+    "version": "1",
+    "evidence": '\n  - "Test evidence one"\n  - "Test evidence two"',
+}
+
+_BODY = """
 ## Insight
 
 This is a test insight with enough content to pass the minimum length
 requirement for the body section of the insight file.
-""")
-            errors = validate_insight(path)
-            assert errors == []
-
-    def test_missing_required_field(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = _write_insight(tmpdir, """---
-id: test-002
-title: "Missing fields"
----
+"""
 
-## Insight
-
-This insight is missing required fields and should fail validation
-with multiple error messages about missing fields.
-""")
-            errors = validate_insight(path)
-            assert len(errors) > 0
-            assert any("Missing required field" in e for e in errors)
-
-    def test_invalid_confidence(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = _write_insight(tmpdir, """---
-id: test-003
-title: "Bad confidence"
-domain: operations
-tags: [test]
-confidence: 1.5
-source_seed: test
-timestamp: 2026-02-10T00:00:00Z
-version: 1
-evidence: ["test"]
----
 
-## Insight
+def _make_insight(body=_BODY, drop=(), **fields):
+    """Render an insight from _BASE_FRONTMATTER with fields overridden."""
+    merged = {**_BASE_FRONTMATTER, **fields}
+    frontmatter = "".join(
+        f"{key}:{value}\n" if not value or value.startswith("\n") else f"{key}: {value}\n"
+        for key, value in merged.items()
+        if key not in drop
+    )
+    return f"---\n{frontmatter}---\n{body}"
 
-This insight has an invalid confidence value that should fail
-the validation check for the confidence range.
-""")
-            errors = validate_insight(path)
-            assert any("confidence" in e for e in errors)
-
-    def test_invalid_domain(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = _write_insight(tmpdir, """---
-id: test-004
-title: "Bad domain"
-domain: invalid_domain
-tags: [test]
-confidence: 0.5
-source_seed: test
-timestamp: 2026-02-10T00:00:00Z
-version: 1
-evidence: ["test"]
----
 
-## Insight
+class TestValidateInsight:
+    def test_valid_insight(self):
+        assert validate_insight_text(_make_insight()) == []
 
-This insight has an invalid domain that should fail the validation
-check for valid domain values in the frontmatter.
-""")
-            errors = validate_insight(path)
-            assert any("domain" in e for e in errors)
+    def test_missing_required_field(self):
+        dropped = validate.REQUIRED_FIELDS[2:]
+        errors = validate_insight_text(_make_insight(drop=dropped))
+        assert errors == [f"Missing required field: {field}" for field in dropped]
+
+    @pytest.mark.parametrize("fields, field", [
+        ({"confidence": "1.5"}, "confidence"),
+        ({"domain": "invalid_domain"}, "domain"),
+    ])
+    def test_invalid_field(self, fields, field):
+        errors = validate_insight_text(_make_insight(**fields))
+        assert any(field in e for e in errors)
+
+    def test_float_version_rejected(self):
+        # Rejected the same way with or without the compiled schema validator
+        content = _make_insight(version="1.0")
+        errors = validate_insight_text(content)
+        assert errors == ["version must be a positive integer"]
+        with patch.object(validate, "_fast_validate", None):
+            assert validate_insight_text(content) == errors
+
+    def test_short_body_counted_in_characters(self):
+        # 40 characters but 120 bytes: still too short
+        content = _make_insight(body="\u65e5" * 40 + "\n")
+        assert any("too short" in e for e in validate_insight_text(content))
+        content = _make_insight(body="\u00e9" * 60 + "\n")
+        assert validate_insight_text(content) == []
+
+    def test_body_check_matches_strip_and_count(self):
+        def reference(body):
+            text = body.strip().decode("utf-8", errors="replace")
+            return len(text.replace("\r\n", "\n").strip()) >= validate.MIN_BODY_CHARS
+
+        bodies = [
+            b"", b" \n\t ", b"x" * 49, b"x" * 50, b"  " + b"x" * 49 + b"\n" * 500,
+            b"x" + b" " * 300 + b"y", b"\n" * 1000 + "\u65e5".encode() * 49,
+            "\u65e5".encode() * 66 + b"\n" * 10, b"a\r\n" * 25,
+        ]
+        prefix = b"---\nid: x\n---"
+        for body in bodies:
+            passed = validate._check_body(prefix + body, len(prefix)) == []
+            assert passed == reference(body), body
+
+    def test_plain_frontmatter_skips_yaml(self):
+        content = (REPO_EXAMPLES / "rate-limiting-prevents-bans.yaml").read_bytes()
+        with patch.object(validate, "_yaml", side_effect=AssertionError):
+            assert validate_insight_text(content) == []
+
+    def test_scanner_agrees_with_yaml(self):
+        variants = [
+            {}, {"evidence": '\n  - "one"\n  - two'}, {"confidence": "1"}, {"confidence": "1.5"}, {"confidence": ".5"},
+            {"confidence": '"0.5"'}, {"confidence": "0.5 # high"}, {"version": "1.0"},
+            {"version": "0"}, {"version": "01"}, {"version": "+1"}, {"domain": "Research"},
+            {"domain": "'research'"}, {"domain": "null"}, {"tags": "[]"}, {"tags": "a, b"},
+            {"tags": "[a, [b]]"}, {"tags": "[a: b]"}, {"tags": "&x [a]"}, {"tags": "|"},
+            {"tags": "\n- a\n- b"}, {"tags": "\n  - a\n - b"}, {"tags": "\n  a: b"},
+            {"evidence": ""}, {"evidence": "\n  - - nested"}, {"evidence": "\n  - k: v"},
+            {"title": "plain: colon"}, {"title": "'it''s'"}, {"title": '"esc\\"x"'},
+            {"title": "two\n  lines"}, {"timestamp": "2026-02-10"}, {"timestamp": "2026-2-10"},
+            {"source_seed": "=", "title": "<<"}, {"id": "*alias"}, {"id": ""},
+        ]
+        for variant in variants:
+            text = _make_insight(**variant)
+            with patch.object(validate, "_scan_frontmatter", return_value=None):
+                expected = validate_insight_text(text)
+            assert validate_insight_text(text) == expected, text
+
+    def test_scanner_defers_unbuildable_timestamps(self):
+        # safe_load raises on these, so the scanner must not accept them
+        for value in ["2026-02-30", "2026-13-01T00:00:00Z", "2026-01-01T24:00:00Z"]:
+            assert validate._scan_frontmatter(f"\nid: x\ntimestamp: {value}\n") is None
+        assert validate._scan_frontmatter("\ntimestamp: 2026-02-28\n") == {"timestamp": "2026-02-28"}
 
     def test_missing_frontmatter(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            path = _write_insight(tmpdir, "Just plain text without frontmatter.")
-            errors = validate_insight(path)
-            assert any("frontmatter" in e.lower() for e in errors)
+        content = "Just plain text without frontmatter."
+        errors = validate_insight_text(content)
+        assert any("frontmatter" in e.lower() for e in errors)
+
+    def test_uses_libyaml_loader_when_available(self):
+        assert validate._yaml() == (yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+    def test_plain_insights_do_not_import_yaml(self):
+        examples = sorted(str(p) for p in REPO_EXAMPLES.glob("*.yaml"))
+        probe = (
+            "import sys; from network.tools import validate; "
+            f"assert not any(validate.validate_many({examples!r})); "
+            "assert 'yaml' not in sys.modules"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", probe], cwd=REPO_EXAMPLES.parent.parent,
+            capture_output=True, timeout=60,
+        )
+        assert result.returncode == 0, result.stderr.decode(errors="replace")
 
     def test_file_not_found(self):
         errors = validate_insight("/nonexistent/path.yaml")
         assert len(errors) == 1
         assert "not found" in errors[0].lower()
+
+
+class TestValidateCache:
+    VALID = (REPO_EXAMPLES / "rate-limiting-prevents-bans.yaml").read_text()
+
+    def _age(self, path):
+        # Past the racy window, where results start being cached
+        old = time.time() - 60
+        os.utime(path, (old, old))
+
+    def test_unchanged_file_reuses_result(self, tmp_path):
+        path = _write_insight(tmp_path, self.VALID)
+        self._age(path)
+        assert validate_insight(path) == []
+        with patch.object(validate, "_validate_file", side_effect=AssertionError):
+            assert validate_insight(path) == []
+
+    def test_changed_file_revalidated(self, tmp_path):
+        path = _write_insight(tmp_path, self.VALID)
+        self._age(path)
+        assert validate_insight(path) == []
+        _write_insight(tmp_path, self.VALID.replace("version: 1", "version: 0"))
+        self._age(path)
+        assert validate_insight(path) == ["version must be a positive integer"]
+
+    def test_read_file_handles_growth_since_stat(self, tmp_path):
+        path = _write_insight(tmp_path, self.VALID * 100)
+        data = Path(path).read_bytes()
+        assert validate._read_file(path, len(data)) == data
+        assert validate._read_file(path, 10) == data
+
+    def test_large_file_judged_on_its_head(self, tmp_path):
+        path = _write_insight(tmp_path, _make_insight(body=_BODY * 20_000))
+        with patch.object(validate, "_read_file", wraps=validate._read_file) as read:
+            assert validate_insight(path) == []
+        read.assert_called_once_with(path, validate._HEAD_BYTES, whole=False)
+
+    @pytest.mark.parametrize("content, expected", [
+        # Whitespace past the head hides how short the body is
+        (_make_insight(body="\n" * 100_000 + "short\n"),
+         [f"Insight body is too short (< {validate.MIN_BODY_CHARS} chars). Add more detail."]),
+        # The closing marker is past the head
+        (_make_insight(evidence="".join(f"\n  - item {i}" for i in range(10_000))), []),
+    ])
+    def test_large_file_read_whole_when_head_is_not_enough(self, tmp_path, content, expected):
+        path = _write_insight(tmp_path, content)
+        assert os.path.getsize(path) > validate._HEAD_BYTES
+        assert validate_insight(path) == expected == validate_insight_text(content)
+
+    def test_recent_file_not_cached(self, tmp_path):
+        path = _write_insight(tmp_path, self.VALID)
+        assert validate_insight(path) == []
+        with patch.object(validate, "_validate_file", return_value=["x"]):
+            assert validate_insight(path) == ["x"]
+
+
+class TestValidateMany:
+    def test_serial_and_pooled_agree(self, tmp_path):
+        paths = []
+        for i in range(20):
+            path = tmp_path / f"insight-{i:02d}.yaml"
+            path.write_text(
+                "Just plain text without frontmatter." if i % 5 == 0 else
+                _make_insight(id=f"test-{i:03d}", title=f'"Batch {i}"'),
+                encoding="utf-8",
+            )
+            paths.append(str(path))
+
+        paths.append(paths[0])  # Duplicates keep their own slot
+        serial = validate_many(paths, workers=1)
+        pooled = validate_many(paths, workers=2)
+        assert len(serial) == len(paths)
+        assert pooled == serial
+        invalid = [p for p, errors in zip(paths, serial) if errors]
+        assert invalid == paths[:20:5] + [paths[0]]
@@ -0,0 +1,114 @@
+"""Tests for the outbox directory watcher."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from connectors.base.watcher import DirectoryWatcher
+
+
+class TestDirectoryWatcher:
+    def test_timeout_without_events(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = DirectoryWatcher(tmpdir)
+            try:
+                assert watcher.wait(0.05) is False
+            finally:
+                watcher.close()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_wakes_on_file_write(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = DirectoryWatcher(tmpdir)
+            try:
+                assert watcher.event_driven
+                timer = threading.Timer(
+                    0.05, lambda: (Path(tmpdir) / "out.json").write_text("{}")
+                )
+                timer.start()
+                start = time.monotonic()
+                assert watcher.wait(5.0) is True
+                assert time.monotonic() - start < 2.0
+            finally:
+                watcher.close()
+
+    def test_wake_interrupts_wait(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = DirectoryWatcher(tmpdir)
+            try:
+                threading.Timer(0.05, watcher.wake).start()
+                start = time.monotonic()
+                assert watcher.wait(10.0) is False
+                assert time.monotonic() - start < 2.0
+            finally:
+                watcher.close()
+
+    def test_close_is_idempotent(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = DirectoryWatcher(tmpdir)
+            watcher.close()
+            watcher.close()
+            assert not watcher.event_driven
+
+    def test_wake_after_close_is_noop(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = DirectoryWatcher(tmpdir)
+            watcher.close()
+            # Whatever reuses the pipe's fd number must not get a wake byte
+            r, w = os.pipe()
+            try:
+                os.set_blocking(r, False)
+                watcher.wake()
+                with pytest.raises(BlockingIOError):
+                    os.read(r, 1)
+            finally:
+                os.close(r)
+                os.close(w)
+
+    def test_wake_races_close(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for _ in range(50):
+                watcher = DirectoryWatcher(tmpdir)
+                waker = threading.Thread(target=lambda w=watcher: [w.wake() for _ in range(100)])
+                waker.start()
+                watcher.close()
+                waker.join()
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+    def test_wait_async_wakes_on_file_write(self):
+        async def scenario(watcher, tmpdir):
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.05, lambda: (Path(tmpdir) / "out.json").write_text("{}"))
+            return await watcher.wait_async(5.0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            watcher = DirectoryWatcher(tmpdir)
+            try:
+                assert asyncio.run(scenario(watcher, tmpdir)) is True
+                assert asyncio.run(watcher.wait_async(0.05)) is False
+            finally:
+                watcher.close()
+
+    def test_wait_async_fallback_honours_wake(self):
+        async def scenario(watcher):
+            asyncio.get_running_loop().call_later(0.05, watcher.wake)
+            start = time.monotonic()
+            assert await watcher.wait_async(10.0) is False
+            return time.monotonic() - start
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("connectors.base.watcher._load_libc", return_value=None):
+                watcher = DirectoryWatcher(tmpdir)
+            try:
+                assert not watcher.event_driven
+                assert asyncio.run(scenario(watcher)) < 5.0
+                assert asyncio.run(watcher.wait_async(0.05)) is False
+            finally:
+                watcher.close()